@@ -21,6 +21,7 @@ from risk_mc import (
 )
 from risk_mc.dashboard_kri import (
     calculate_kpi_kri_summary,
+    enrich_register,
     generate_trend_data,
     plot_top_exposures,
     plot_trend_chart,
@@ -194,28 +195,31 @@ def main():
     # Quantify register for KPI/KRI analysis
     quantified_df = quantify_register(register_df, n_sims=n_sims, seed=seed)
 
+    # Derive inherent/residual columns once for all dashboard components
+    kri_df = enrich_register(quantified_df)
+
     # 6. Residual vs Inherent Heatmap
     print("   → Residual vs Inherent heatmap...")
-    fig_heatmap = residual_vs_inherent_heatmap(quantified_df, use_plotly=False)
+    fig_heatmap = residual_vs_inherent_heatmap(kri_df, use_plotly=False)
     heatmap_path = artifacts_dir / "residual_inherent_heatmap.png"
     save_figure(fig_heatmap, str(heatmap_path))
 
     # 7. Top Exposures Chart
     print("   → Top 5 exposures chart...")
-    fig_top_exp = plot_top_exposures(quantified_df, metric="mean", top_n=5)
+    fig_top_exp = plot_top_exposures(kri_df, metric="mean", top_n=5)
     top_exp_path = artifacts_dir / "top_exposures.png"
     save_figure(fig_top_exp, str(top_exp_path))
 
     # 8. Trend Chart
     print("   → Risk exposure trends...")
-    trend_df = generate_trend_data(quantified_df, n_periods=8, period_label="Quarter")
+    trend_df = generate_trend_data(kri_df, n_periods=8, period_label="Quarter")
     fig_trend = plot_trend_chart(trend_df)
     trend_path = artifacts_dir / "risk_trends.png"
     save_figure(fig_trend, str(trend_path))
 
     # 9. Calculate KPI/KRI Summary
     print("   → Calculating KPI/KRI metrics...")
-    kpi_kri = calculate_kpi_kri_summary(quantified_df)
+    kpi_kri = calculate_kpi_kri_summary(kri_df)
 
     print()
 
@@ -359,7 +359,9 @@ def display_monte_carlo_tab():
         results_with_cat = results.merge(df[["risk_id", "category"]], on="risk_id", how="left")
 
         category_losses = (
-            results_with_cat.groupby("category")["mean_loss"].sum().sort_values(ascending=False)
+            results_with_cat.groupby("category", observed=True)["mean_loss"]
+            .sum()
+            .sort_values(ascending=False)
         )
 
         fig = px.bar(
@@ -588,7 +590,7 @@ def display_kpi_dashboard():
     with col2:
         # By category
         category_comparison = (
-            df.groupby("category")
+            df.groupby("category", observed=True)
             .agg({"inherent_risk_score": "sum", "residual_risk_score": "sum"})
             .reset_index()
         )
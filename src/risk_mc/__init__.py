@@ -8,14 +8,22 @@ __version__ = "1.0.0"
 
 from .dashboard_kri import (
     calculate_kpi_kri_summary,
+    enrich_register,
     generate_trend_data,
     plot_top_exposures,
     plot_trend_chart,
     residual_vs_inherent_heatmap,
     top_exposures,
 )
-from .io import load_register, quantify_register, save_quantified_register
-from .lec import lec_points, plot_lec_matplotlib, plot_lec_plotly
+from .io import compare_scenarios, load_register, quantify_register, save_quantified_register
+from .lec import (
+    LossCDF,
+    exceedance_probs,
+    lec_points,
+    plot_lec_matplotlib,
+    plot_lec_plotly,
+    return_periods,
+)
 from .metrics import marginal_contribution_to_var, summary, tornado_data, tvar, var
 from .simulate import simulate_annual_loss, simulate_portfolio
 
@@ -30,10 +38,15 @@ __all__ = [
     "lec_points",
     "plot_lec_matplotlib",
     "plot_lec_plotly",
+    "exceedance_probs",
+    "return_periods",
+    "LossCDF",
     "load_register",
     "quantify_register",
     "save_quantified_register",
+    "compare_scenarios",
     "calculate_kpi_kri_summary",
+    "enrich_register",
     "residual_vs_inherent_heatmap",
     "top_exposures",
     "plot_top_exposures",
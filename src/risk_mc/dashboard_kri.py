@@ -5,20 +5,68 @@ Provides functions for generating Key Performance Indicators (KPIs)
 and Key Risk Indicators (KRIs) for risk management dashboards.
 """
 
+import importlib.util
+import sys
 from typing import Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 
-# Seaborn is optional
-try:
-    import seaborn as sns
+# Plotly and seaborn are imported lazily inside the functions that use them;
+# importing them here adds noticeable cold-start time for matplotlib-only callers.
+HAS_SEABORN = importlib.util.find_spec("seaborn") is not None
 
-    HAS_SEABORN = True
-except ImportError:
-    HAS_SEABORN = False
+
+def enrich_register(quantified_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add derived inherent/residual exposure columns to a quantified register.
+
+    Computes the columns shared by the dashboard functions in one pass so they
+    are not recomputed by each caller:
+        - InherentLoss: SimMean with controls reversed
+          (SimMean / (ResidualFactor * (1 - ControlEffectiveness + 0.01)));
+          the PORTFOLIO_TOTAL row holds the sum over individual risks
+        - ResidualLoss: SimMean (after controls)
+        - Mitigation: (InherentLoss - ResidualLoss) / InherentLoss * 100
+        - pct_of_total_mean: SimMean as % of the portfolio SimMean
+        - pct_of_total_var95: SimVaR95 as % of the portfolio SimVaR95 (if present)
+
+    Args:
+        quantified_df: Quantified risk register (output of quantify_register)
+
+    Returns:
+        New DataFrame with the derived columns added
+    """
+    is_total = quantified_df["RiskID"].to_numpy() == "PORTFOLIO_TOTAL"
+    sim_mean = quantified_df["SimMean"].to_numpy(dtype=np.float64)
+    residual_factor = quantified_df["ResidualFactor"].to_numpy(dtype=np.float64)
+    control_eff = quantified_df["ControlEffectiveness"].to_numpy(dtype=np.float64)
+
+    # Estimate inherent loss (reverse the control effectiveness)
+    inherent = sim_mean / (residual_factor * (1 - control_eff + 0.01))
+    if is_total.any():
+        inherent[is_total] = inherent[~is_total].sum()
+
+    derived = {
+        "InherentLoss": inherent,
+        "ResidualLoss": sim_mean,
+        "Mitigation": (inherent - sim_mean) / inherent * 100,
+        "pct_of_total_mean": sim_mean / _portfolio_value(sim_mean, is_total) * 100,
+    }
+
+    if "SimVaR95" in quantified_df.columns:
+        var95 = quantified_df["SimVaR95"].to_numpy(dtype=np.float64)
+        derived["pct_of_total_var95"] = var95 / _portfolio_value(var95, is_total) * 100
+
+    return quantified_df.assign(**derived)
+
+
+def _portfolio_value(values: np.ndarray, is_total: np.ndarray) -> float:
+    """Portfolio-level value of a metric: the PORTFOLIO_TOTAL row, else the sum of risks."""
+    if is_total.any():
+        return values[is_total][0]
+    return values.sum()
 
 
 def residual_vs_inherent_heatmap(
@@ -35,18 +83,15 @@ def residual_vs_inherent_heatmap(
     Returns:
         matplotlib Figure or plotly Figure
     """
-    # Calculate inherent risk (before controls)
-    # Inherent = Residual / ResidualFactor / (1 - ControlEffectiveness)
-    df = quantified_df[quantified_df["RiskID"] != "PORTFOLIO_TOTAL"].copy()
+    # Inherent/residual/mitigation columns come from enrich_register
+    if "InherentLoss" not in quantified_df.columns:
+        quantified_df = enrich_register(quantified_df)
 
-    # Estimate inherent loss (reverse the control effectiveness)
-    df["InherentLoss"] = df["SimMean"] / (
-        df["ResidualFactor"] * (1 - df["ControlEffectiveness"] + 0.01)
-    )
-    df["ResidualLoss"] = df["SimMean"]
-    df["Mitigation"] = (df["InherentLoss"] - df["ResidualLoss"]) / df["InherentLoss"] * 100
+    df = quantified_df.iloc[quantified_df["RiskID"].to_numpy() != "PORTFOLIO_TOTAL"]
 
     if use_plotly:
+        import plotly.graph_objects as go
+
         # Create plotly scatter plot
         fig = go.Figure()
 
@@ -173,15 +218,16 @@ def top_exposures(
 
     col_name = metric_map.get(metric, "SimMean")
 
-    # Filter out portfolio total
-    df = quantified_df[quantified_df["RiskID"] != "PORTFOLIO_TOTAL"].copy()
+    # Filter out portfolio total (read-only, so no copy needed)
+    is_total = quantified_df["RiskID"].to_numpy() == "PORTFOLIO_TOTAL"
+    df = quantified_df.iloc[~is_total]
 
     # Sort and get top N
     df_sorted = df.nlargest(top_n, col_name)
 
     # Calculate percentage of total
-    total = quantified_df[quantified_df["RiskID"] == "PORTFOLIO_TOTAL"][col_name].values[0]
-    df_sorted["pct_of_total"] = df_sorted[col_name] / total * 100
+    total = quantified_df[col_name].to_numpy()[is_total][0]
+    df_sorted = df_sorted.assign(pct_of_total=df_sorted[col_name] / total * 100)
 
     return df_sorted[["RiskID", "Category", col_name, "pct_of_total"]]
 
@@ -290,26 +336,25 @@ def generate_trend_data(
     top3_sum = individual.nlargest(3, "SimMean")["SimMean"].sum()
     base_concentration = top3_sum / base_mean * 100
 
-    np.random.seed(42)
-
-    periods = []
-    for i in range(n_periods):
-        # Random walk with mean reversion
-        mean_factor = 1 + np.random.normal(0, volatility) - volatility * 0.5
-        var_factor = 1 + np.random.normal(0, volatility * 1.2) - volatility * 0.6
-        conc_factor = 1 + np.random.normal(0, volatility * 0.5)
-
-        periods.append(
-            {
-                "period": i + 1,
-                "period_label": f"{period_label} {i + 1}",
-                "mean_loss": base_mean * mean_factor * (1 + i * 0.02),  # Slight upward trend
-                "var_95": base_var95 * var_factor * (1 + i * 0.025),
-                "concentration": min(100, base_concentration * conc_factor),
-            }
-        )
-
-    return pd.DataFrame(periods)
+    # Own generator, so the global NumPy random state is left untouched
+    rng = np.random.default_rng(42)
+    shocks = rng.standard_normal((n_periods, 3)) * (volatility * np.array([1.0, 1.2, 0.5]))
+    steps = np.arange(n_periods)
+
+    # Random walk with mean reversion
+    mean_factor = 1 + shocks[:, 0] - volatility * 0.5
+    var_factor = 1 + shocks[:, 1] - volatility * 0.6
+    conc_factor = 1 + shocks[:, 2]
+
+    return pd.DataFrame(
+        {
+            "period": steps + 1,
+            "period_label": [f"{period_label} {i + 1}" for i in steps],
+            "mean_loss": base_mean * mean_factor * (1 + steps * 0.02),  # Slight upward trend
+            "var_95": base_var95 * var_factor * (1 + steps * 0.025),
+            "concentration": np.minimum(100, base_concentration * conc_factor),
+        }
+    )
 
 
 def plot_trend_chart(trend_df: pd.DataFrame, figsize: tuple[int, int] = (12, 6)) -> plt.Figure:
@@ -391,22 +436,23 @@ def calculate_kpi_kri_summary(
     Returns:
         Dictionary with KPIs and KRIs
     """
+    # Inherent/residual columns come from enrich_register
+    if "InherentLoss" not in quantified_df.columns:
+        quantified_df = enrich_register(quantified_df)
+
     # Get portfolio totals
-    portfolio = quantified_df[quantified_df["RiskID"] == "PORTFOLIO_TOTAL"].iloc[0]
-    individual = quantified_df[quantified_df["RiskID"] != "PORTFOLIO_TOTAL"].copy()
+    is_total = quantified_df["RiskID"].to_numpy() == "PORTFOLIO_TOTAL"
+    portfolio = quantified_df.iloc[np.flatnonzero(is_total)[0]]
+    individual = quantified_df.iloc[~is_total]
 
-    # Calculate inherent risk (reverse engineering)
     total_residual = portfolio["SimMean"]
+    total_inherent = portfolio["InherentLoss"]
 
-    # Estimate total inherent (simplified)
     avg_control_eff = individual["ControlEffectiveness"].mean()
     avg_residual_factor = individual["ResidualFactor"].mean()
-    total_inherent = total_residual / (avg_residual_factor * (1 - avg_control_eff + 0.01))
 
     # Calculate mitigation effectiveness
-    mitigation_pct = (
-        ((total_inherent - total_residual) / total_inherent * 100) if total_inherent > 0 else 0
-    )
+    mitigation_pct = portfolio["Mitigation"] if total_inherent > 0 else 0
 
     # Top risk driver
     top_risk = individual.nlargest(1, "SimMean").iloc[0]
@@ -446,6 +492,51 @@ def calculate_kpi_kri_summary(
     }
 
 
+def format_kpi_kri_summary(kpi_kri: dict[str, any]) -> str:
+    """
+    Format KPI/KRI summary as a single report string.
+
+    Args:
+        kpi_kri: Dictionary from calculate_kpi_kri_summary
+
+    Returns:
+        Multi-line summary text
+    """
+    lines = [
+        "=" * 80,
+        "KPI/KRI DASHBOARD SUMMARY",
+        "=" * 80,
+        "",
+        "📊 KEY PERFORMANCE INDICATORS (KPIs)",
+        "-" * 80,
+        f"Total Inherent Loss (Before Controls):  ${kpi_kri['total_inherent_loss']:>15,.0f}",
+        f"Total Residual Loss (After Controls):   ${kpi_kri['total_residual_loss']:>15,.0f}",
+        f"Mitigation Amount:                       ${kpi_kri['mitigation_amount']:>15,.0f}",
+        f"Mitigation Effectiveness:                {kpi_kri['mitigation_effectiveness_pct']:>15.1f}%",
+        f"Average Control Effectiveness:           {kpi_kri['avg_control_effectiveness']:>15.1f}%",
+        "",
+        "⚠️  KEY RISK INDICATORS (KRIs)",
+        "-" * 80,
+        f"Expected Annual Loss:                    ${kpi_kri['expected_loss']:>15,.0f}",
+        f"95% Value at Risk (1-in-20 year):       ${kpi_kri['portfolio_var_95']:>15,.0f}",
+        f"99% Value at Risk (1-in-100 year):      ${kpi_kri['portfolio_var_99']:>15,.0f}",
+        f"95% Tail VaR (Expected Shortfall):      ${kpi_kri['portfolio_tvar_95']:>15,.0f}",
+        "",
+        "🎯 CONCENTRATION METRICS",
+        "-" * 80,
+        f"Top Risk Driver:                         {kpi_kri['top_risk_id']} ({kpi_kri['top_risk_category']})",
+        f"Top Risk Mean Loss:                      ${kpi_kri['top_risk_mean']:>15,.0f}",
+        f"Top Risk Contribution:                   {kpi_kri['top_risk_contribution_pct']:>15.1f}%",
+        f"Concentration Ratio (Top 3 / Total):    {kpi_kri['concentration_ratio_pct']:>15.1f}%",
+        f"Number of Risks:                         {kpi_kri['number_of_risks']:>15}",
+        f"Average Risk Size:                       ${kpi_kri['average_risk_size']:>15,.0f}",
+        "",
+        "=" * 80,
+    ]
+
+    return "\n".join(lines)
+
+
 def print_kpi_kri_summary(kpi_kri: dict[str, any]):
     """
     Print formatted KPI/KRI summary.
@@ -453,43 +544,5 @@ def print_kpi_kri_summary(kpi_kri: dict[str, any]):
     Args:
         kpi_kri: Dictionary from calculate_kpi_kri_summary
     """
-    print("=" * 80)
-    print("KPI/KRI DASHBOARD SUMMARY")
-    print("=" * 80)
-    print()
-
-    print("📊 KEY PERFORMANCE INDICATORS (KPIs)")
-    print("-" * 80)
-    print(f"Total Inherent Loss (Before Controls):  ${kpi_kri['total_inherent_loss']:>15,.0f}")
-    print(f"Total Residual Loss (After Controls):   ${kpi_kri['total_residual_loss']:>15,.0f}")
-    print(f"Mitigation Amount:                       ${kpi_kri['mitigation_amount']:>15,.0f}")
-    print(
-        f"Mitigation Effectiveness:                {kpi_kri['mitigation_effectiveness_pct']:>15.1f}%"
-    )
-    print(
-        f"Average Control Effectiveness:           {kpi_kri['avg_control_effectiveness']:>15.1f}%"
-    )
-    print()
-
-    print("⚠️  KEY RISK INDICATORS (KRIs)")
-    print("-" * 80)
-    print(f"Expected Annual Loss:                    ${kpi_kri['expected_loss']:>15,.0f}")
-    print(f"95% Value at Risk (1-in-20 year):       ${kpi_kri['portfolio_var_95']:>15,.0f}")
-    print(f"99% Value at Risk (1-in-100 year):      ${kpi_kri['portfolio_var_99']:>15,.0f}")
-    print(f"95% Tail VaR (Expected Shortfall):      ${kpi_kri['portfolio_tvar_95']:>15,.0f}")
-    print()
-
-    print("🎯 CONCENTRATION METRICS")
-    print("-" * 80)
-    print(
-        f"Top Risk Driver:                         {kpi_kri['top_risk_id']} ({kpi_kri['top_risk_category']})"
-    )
-    print(f"Top Risk Mean Loss:                      ${kpi_kri['top_risk_mean']:>15,.0f}")
-    print(
-        f"Top Risk Contribution:                   {kpi_kri['top_risk_contribution_pct']:>15.1f}%"
-    )
-    print(f"Concentration Ratio (Top 3 / Total):    {kpi_kri['concentration_ratio_pct']:>15.1f}%")
-    print(f"Number of Risks:                         {kpi_kri['number_of_risks']:>15}")
-    print(f"Average Risk Size:                       ${kpi_kri['average_risk_size']:>15,.0f}")
-    print()
-    print("=" * 80)
+    # One write instead of a print per line
+    sys.stdout.write(format_kpi_kri_summary(kpi_kri) + "\n")
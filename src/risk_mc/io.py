@@ -6,21 +6,59 @@ Supports CSV and Excel formats with validation.
 
 import warnings
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import numpy as np
 import pandas as pd
 
-
-def load_register(path: str, required_columns: Optional[list[str]] = None) -> pd.DataFrame:
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from .metrics import _check_precision, _summary_stats_columns
+
+# Metric name (as returned by metrics.summary) -> quantified register column
+_METRIC_COLUMNS = {
+    "mean": "SimMean",
+    "median": "SimMedian",
+    "std": "SimStd",
+    "p90": "SimP90",
+    "p95": "SimP95",
+    "p99": "SimP99",
+    "var_95": "SimVaR95",
+    "var_99": "SimVaR99",
+    "tvar_95": "SimTVaR95",
+    "tvar_99": "SimTVaR99",
+}
+
+# Quantified register column -> metric name, in quantify_register output order
+_SIM_COLUMNS = {col: metric for metric, col in _METRIC_COLUMNS.items()}
+
+
+def load_register(
+    path: Union[str, pd.DataFrame],
+    required_columns: Optional[list[str]] = None,
+    chunksize: Optional[int] = None,
+    validate: bool = True,
+) -> pd.DataFrame:
     """
-    Load risk register from CSV or Excel file.
+    Load risk register from CSV, Excel, Parquet or Feather file.
 
-    Performs type coercion and validation.
+    Performs type coercion and validation. An already-loaded DataFrame can be
+    passed instead of a path, in which case no file is read.
 
     Args:
-        path: Path to CSV or Excel file
+        path: Path to CSV, Excel, Parquet or Feather file, or a register DataFrame
         required_columns: Optional list of required column names
+        chunksize: Optional number of rows per chunk when reading CSV. Each
+            chunk is type-coerced as it is read, which bounds the size of the
+            intermediate copies for very large registers.
+        validate: Whether to run register validation (default: True). Can be
+            turned off for registers that have already been validated.
 
     Returns:
         DataFrame with validated risk register
@@ -28,21 +66,6 @@ def load_register(path: str, required_columns: Optional[list[str]] = None) -> pd
     Raises:
         ValueError: If file format unsupported or validation fails
     """
-    path_obj = Path(path)
-
-    if not path_obj.exists():
-        raise FileNotFoundError(f"Risk register file not found: {path}")
-
-    # Load based on extension
-    suffix = path_obj.suffix.lower()
-
-    if suffix == ".csv":
-        df = pd.read_csv(path)
-    elif suffix in [".xlsx", ".xls"]:
-        df = pd.read_excel(path)
-    else:
-        raise ValueError(f"Unsupported file format: {suffix}. Use .csv, .xlsx, or .xls")
-
     # Validate required columns
     if required_columns is None:
         required_columns = [
@@ -54,23 +77,60 @@ def load_register(path: str, required_columns: Optional[list[str]] = None) -> pd
             "SevParam2",
         ]
 
-    missing = set(required_columns) - set(df.columns)
-    if missing:
-        raise ValueError(f"Missing required columns: {missing}")
+    if isinstance(path, pd.DataFrame):
+        df = _coerce_types(_check_required_columns(path, required_columns))
+        return _validate_register(df) if validate else df
 
-    # Type coercion
-    df = _coerce_types(df)
+    path_obj = Path(path)
+
+    if not path_obj.exists():
+        raise FileNotFoundError(f"Risk register file not found: {path}")
+
+    # Load based on extension
+    suffix = path_obj.suffix.lower()
+
+    if suffix == ".csv" and chunksize is not None:
+        # Type coercion per chunk
+        chunks = [
+            _coerce_types(_check_required_columns(chunk, required_columns))
+            for chunk in pd.read_csv(path, chunksize=chunksize)
+        ]
+        df = pd.concat(chunks, ignore_index=True, copy=False)
+    else:
+        if suffix == ".csv":
+            df = pd.read_csv(path)
+        elif suffix in [".xlsx", ".xls"]:
+            df = pd.read_excel(path)
+        elif suffix == ".parquet":
+            df = pd.read_parquet(path)
+        elif suffix == ".feather":
+            df = pd.read_feather(path)
+        else:
+            raise ValueError(
+                f"Unsupported file format: {suffix}. Use .csv, .xlsx, .xls, .parquet, or .feather"
+            )
+
+        # Type coercion
+        df = _coerce_types(_check_required_columns(df, required_columns))
 
     # Validation
-    df = _validate_register(df)
+    if validate:
+        df = _validate_register(df)
+
+    return df
+
+
+def _check_required_columns(df: pd.DataFrame, required_columns: list[str]) -> pd.DataFrame:
+    """Raise if any required column is missing; return df unchanged otherwise."""
+    missing = set(required_columns) - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
 
     return df
 
 
 def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
     """Coerce columns to appropriate types."""
-    df = df.copy()
-
     # Numeric columns
     numeric_cols = [
         "FreqParam1",
@@ -82,30 +142,39 @@ def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
         "ResidualFactor",
     ]
 
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
     # String columns
     string_cols = ["RiskID", "Category", "Description", "FrequencyModel", "SeverityModel"]
 
-    for col in string_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str)
-
-    # Set defaults for optional columns
-    if "ControlEffectiveness" not in df.columns:
-        df["ControlEffectiveness"] = 0.0
-    else:
-        df["ControlEffectiveness"] = df["ControlEffectiveness"].fillna(0.0)
+    # Columns that are already numeric (e.g. from a DataFrame or Parquet input) need no parsing
+    present_numeric = [
+        col
+        for col in numeric_cols
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])
+    ]
+    # Columns that already hold only strings (the usual case for CSV input) keep their values
+    present_string = [
+        col
+        for col in string_cols
+        if col in df.columns and pd.api.types.infer_dtype(df[col], skipna=False) != "string"
+    ]
 
-    if "ResidualFactor" not in df.columns:
-        df["ResidualFactor"] = 1.0
-    else:
-        df["ResidualFactor"] = df["ResidualFactor"].fillna(1.0)
+    # Add missing optional columns up front, then convert in bulk
+    df = df.reindex(
+        columns=df.columns.union(
+            ["ControlEffectiveness", "ResidualFactor", "SevParam3"], sort=False
+        )
+    )
+    if present_numeric:
+        df[present_numeric] = pd.DataFrame(
+            {col: pd.to_numeric(df[col], errors="coerce") for col in present_numeric},
+            index=df.index,
+        )
+    if present_string:
+        df[present_string] = df[present_string].astype(str)
 
-    if "SevParam3" not in df.columns:
-        df["SevParam3"] = None
+    # Set defaults for optional columns
+    defaults = {"ControlEffectiveness": 0.0, "ResidualFactor": 1.0}
+    df[list(defaults)] = df[list(defaults)].fillna(defaults)
 
     return df
 
@@ -126,16 +195,16 @@ def _validate_register(df: pd.DataFrame) -> pd.DataFrame:
     # Validate frequency models
     valid_freq_models = ["poisson", "negbin"]
     if "FrequencyModel" in df.columns:
-        invalid = df[~df["FrequencyModel"].str.lower().isin(valid_freq_models)]
+        invalid = _invalid_model_rows(df, "FrequencyModel", valid_freq_models)
         if len(invalid) > 0:
-            errors.append(f"Invalid frequency models in rows: {invalid.index.tolist()}")
+            errors.append(f"Invalid frequency models in rows: {invalid}")
 
     # Validate severity models
     valid_sev_models = ["lognormal", "normal", "pert"]
     if "SeverityModel" in df.columns:
-        invalid = df[~df["SeverityModel"].str.lower().isin(valid_sev_models)]
+        invalid = _invalid_model_rows(df, "SeverityModel", valid_sev_models)
         if len(invalid) > 0:
-            errors.append(f"Invalid severity models in rows: {invalid.index.tolist()}")
+            errors.append(f"Invalid severity models in rows: {invalid}")
 
     # Validate parameter ranges
     if "ControlEffectiveness" in df.columns:
@@ -156,8 +225,19 @@ def _validate_register(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _invalid_model_rows(df: pd.DataFrame, col: str, valid_models: list[str]) -> list:
+    """Index labels of rows whose model name is not in valid_models (case-insensitive)."""
+    lowered = np.char.lower(df[col].to_numpy().astype(str))
+    return df.index[~np.isin(lowered, valid_models)].tolist()
+
+
 def quantify_register(
-    register_df: pd.DataFrame, n_sims: int = 50_000, seed: Optional[int] = None
+    register_df: pd.DataFrame,
+    n_sims: int = 50_000,
+    seed: Optional[int] = None,
+    precision: str = "float64",
+    n_jobs: int = 1,
+    portfolio_df: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
     """
     Quantify risk register by running Monte Carlo simulation.
@@ -168,6 +248,13 @@ def quantify_register(
         register_df: Risk register DataFrame with required columns
         n_sims: Number of Monte Carlo simulations (default: 50,000)
         seed: Random seed for reproducibility (default: None)
+        precision: "float64" (default) or "float32" for computing the metrics.
+            float32 halves the working copy; results are still stored as float64.
+        n_jobs: Number of threads simulating risks concurrently (-1 for one
+            per CPU); passed to simulate_portfolio. Results do not depend on it.
+        portfolio_df: Optional output of simulate_portfolio for this register.
+            When given it is summarised as is, and n_sims, seed and n_jobs are
+            not used, so callers that keep the samples simulate only once.
 
     Returns:
         DataFrame with original risk data plus quantified metrics:
@@ -180,73 +267,105 @@ def quantify_register(
     """
     from .simulate import simulate_portfolio
 
-    # Run simulation
-    portfolio_df = simulate_portfolio(register_df, n_sims=n_sims, seed=seed)
-
-    # Start with original register
-    quantified_df = register_df.copy()
+    # Run simulation unless the caller already has the samples
+    if portfolio_df is None:
+        portfolio_df = simulate_portfolio(register_df, n_sims=n_sims, seed=seed, n_jobs=n_jobs)
 
-    # Extract risk columns from portfolio simulation
-    risk_columns = [col for col in portfolio_df.columns if col.startswith("by_risk:")]
+    # Calculate all metrics for the portfolio and every risk in one pass
+    portfolio_stats, risk_stats = _simulation_stats(register_df, portfolio_df, precision)
+    metrics = {
+        risk_id: {sim_col: stats[stat] for sim_col, stat in _SIM_COLUMNS.items()}
+        for risk_id, stats in risk_stats.items()
+    }
 
-    # Calculate metrics for each risk
-    for col in risk_columns:
-        risk_id = col.replace("by_risk:", "")
-        losses = portfolio_df[col].values
-
-        # Find matching row in register
-        mask = quantified_df["RiskID"] == risk_id
-
-        if not mask.any():
-            warnings.warn(f"Risk {risk_id} in simulation but not in register", stacklevel=2)
-            continue
-
-        # Calculate all metrics
-        quantified_df.loc[mask, "SimMean"] = np.mean(losses)
-        quantified_df.loc[mask, "SimMedian"] = np.median(losses)
-        quantified_df.loc[mask, "SimStd"] = np.std(losses)
-        quantified_df.loc[mask, "SimP90"] = np.percentile(losses, 90)
-        quantified_df.loc[mask, "SimP95"] = np.percentile(losses, 95)
-        quantified_df.loc[mask, "SimP99"] = np.percentile(losses, 99)
-        quantified_df.loc[mask, "SimVaR95"] = np.percentile(losses, 95)
-        quantified_df.loc[mask, "SimVaR99"] = np.percentile(losses, 99)
-
-        # TVaR (Expected Shortfall)
-        var95 = np.percentile(losses, 95)
-        tail95 = losses[losses >= var95]
-        quantified_df.loc[mask, "SimTVaR95"] = np.mean(tail95) if len(tail95) > 0 else var95
-
-        var99 = np.percentile(losses, 99)
-        tail99 = losses[losses >= var99]
-        quantified_df.loc[mask, "SimTVaR99"] = np.mean(tail99) if len(tail99) > 0 else var99
+    # Join metrics onto the original register in one pass
+    quantified_df = _merge_metrics(register_df, metrics, list(_SIM_COLUMNS))
 
     # Add portfolio total row
-    portfolio_losses = portfolio_df["portfolio_loss"].values
     portfolio_row = {
         "RiskID": "PORTFOLIO_TOTAL",
         "Category": "Portfolio",
         "Description": "Total portfolio loss",
-        "SimMean": np.mean(portfolio_losses),
-        "SimMedian": np.median(portfolio_losses),
-        "SimStd": np.std(portfolio_losses),
-        "SimP90": np.percentile(portfolio_losses, 90),
-        "SimP95": np.percentile(portfolio_losses, 95),
-        "SimP99": np.percentile(portfolio_losses, 99),
-        "SimVaR95": np.percentile(portfolio_losses, 95),
-        "SimVaR99": np.percentile(portfolio_losses, 99),
+        **{sim_col: portfolio_stats[stat] for sim_col, stat in _SIM_COLUMNS.items()},
     }
 
-    var95 = np.percentile(portfolio_losses, 95)
-    tail95 = portfolio_losses[portfolio_losses >= var95]
-    portfolio_row["SimTVaR95"] = np.mean(tail95) if len(tail95) > 0 else var95
+    quantified_df = _append_portfolio_row(quantified_df, portfolio_row)
 
-    var99 = np.percentile(portfolio_losses, 99)
-    tail99 = portfolio_losses[portfolio_losses >= var99]
-    portfolio_row["SimTVaR99"] = np.mean(tail99) if len(tail99) > 0 else var99
+    return quantified_df
 
-    quantified_df = pd.concat([quantified_df, pd.DataFrame([portfolio_row])], ignore_index=True)
 
-    return quantified_df
+def compare_scenarios(
+    register_df: pd.DataFrame,
+    scenarios: dict[str, dict[str, dict]],
+    n_sims: int = 50_000,
+    seed: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Compare portfolio metrics for the base register and what-if scenarios.
+
+    The base portfolio is simulated once. Each scenario re-simulates only the
+    risks it overrides (with the same per-risk seeds as the base run) and
+    splices them into the base loss matrix, so unchanged risks are never
+    re-simulated and scenario differences are not blurred by sampling noise.
+
+    Args:
+        register_df: Risk register DataFrame
+        scenarios: Mapping of scenario name to {RiskID: {column: value}}
+            overrides, e.g. {"High_Freq": {"R1": {"FreqParam1": 3.0}}}
+        n_sims: Number of Monte Carlo simulations
+        seed: Random seed for reproducibility
+
+    Returns:
+        DataFrame with one row per scenario ("Base" first): a scenario column
+        plus the portfolio summary statistics (mean, median, std, ..., tvar_99)
+
+    Raises:
+        ValueError: If the register repeats a RiskID, or a scenario overrides
+            a risk that is not in the register
+    """
+    from .simulate import _risk_seeds, simulate_annual_loss, simulate_portfolio
+
+    # Overrides are applied by RiskID to one column per risk, so IDs must be unique
+    duplicated = register_df["RiskID"][register_df["RiskID"].duplicated()].unique()
+    if len(duplicated):
+        repeated = ", ".join(map(str, duplicated))
+        raise ValueError(f"compare_scenarios requires unique RiskIDs, repeated: {repeated}")
+
+    # Fix the entropy up front so unseeded runs still share streams with the base
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    portfolio_df = simulate_portfolio(register_df, n_sims=n_sims, seed=seed)
+    base_matrix = portfolio_df.drop(columns="portfolio_loss").to_numpy(dtype=np.float64)
+
+    # simulate_portfolio gives risk i the i-th seed; reuse it for overrides
+    risk_seeds = _risk_seeds(len(register_df), seed)
+    positions = {risk_id: idx for idx, risk_id in enumerate(register_df["RiskID"])}
+
+    names = ["Base"]
+    portfolio_losses = [base_matrix.sum(axis=1)]
+
+    for name, overrides in scenarios.items():
+        unknown = [risk_id for risk_id in overrides if risk_id not in positions]
+        if unknown:
+            raise ValueError(f"Scenario '{name}' references unknown risks: {', '.join(unknown)}")
+
+        loss_matrix = base_matrix.copy()
+        for risk_id, updates in overrides.items():
+            idx = positions[risk_id]
+            risk_row = register_df.iloc[idx].copy()
+            for col, value in updates.items():
+                risk_row[col] = value
+            loss_matrix[:, idx] = simulate_annual_loss(
+                risk_row, n_sims=n_sims, rng=np.random.default_rng(risk_seeds[idx])
+            )
+
+        names.append(name)
+        portfolio_losses.append(loss_matrix.sum(axis=1))
+
+    # Summarise every scenario's portfolio total in one batched call
+    stats = _summary_stats_columns(np.column_stack(portfolio_losses))
+    return pd.DataFrame({"scenario": names, **stats})
 
 
 def save_quantified_register(
@@ -261,79 +380,156 @@ def save_quantified_register(
     Args:
         register_df: Original risk register
         portfolio_df: Simulation results from simulate_portfolio
-        out_path: Output path for CSV file
+        out_path: Output path; .parquet and .feather are written in binary
+            columnar form (requires pyarrow), anything else as CSV (with
+            pyarrow's CSV writer when it is installed)
         metrics_to_include: List of metrics to calculate (default: standard set)
     """
     if metrics_to_include is None:
         metrics_to_include = ["mean", "var_95", "var_99", "tvar_95", "tvar_99"]
 
-    # Start with original register
-    output_df = register_df.copy()
+    metric_columns = {
+        metric: sim_col
+        for metric, sim_col in _METRIC_COLUMNS.items()
+        if metric in metrics_to_include
+    }
 
-    # Calculate metrics for each risk
-    risk_columns = [col for col in portfolio_df.columns if col.startswith("by_risk:")]
+    # Calculate all metrics for the portfolio and every risk in one pass
+    portfolio_stats, risk_stats = _simulation_stats(register_df, portfolio_df)
+    metrics = {
+        risk_id: {sim_col: stats[metric] for metric, sim_col in metric_columns.items()}
+        for risk_id, stats in risk_stats.items()
+    }
 
-    for col in risk_columns:
-        risk_id = col.replace("by_risk:", "")
-        losses = portfolio_df[col].values
+    # Join metrics onto the original register in one pass
+    output_df = _merge_metrics(register_df, metrics, list(metric_columns.values()))
 
-        # Find matching row in register
-        mask = output_df["RiskID"] == risk_id
+    # Add portfolio total row
+    portfolio_row = {
+        "RiskID": "PORTFOLIO_TOTAL",
+        "Category": "Portfolio",
+        "Description": "Total portfolio loss",
+        **{
+            _METRIC_COLUMNS[metric]: portfolio_stats[metric]
+            for metric in ["mean", "var_95", "var_99", "tvar_95", "tvar_99"]
+        },
+    }
 
-        if not mask.any():
-            warnings.warn(f"Risk {risk_id} in simulation but not in register", stacklevel=2)
-            continue
+    output_df = _append_portfolio_row(output_df, portfolio_row)
 
-        # Calculate and store metrics
-        if "mean" in metrics_to_include:
-            output_df.loc[mask, "SimMean"] = np.mean(losses)
+    # Save in the format implied by the extension
+    suffix = Path(out_path).suffix.lower()
 
-        if "median" in metrics_to_include:
-            output_df.loc[mask, "SimMedian"] = np.median(losses)
+    if suffix == ".parquet":
+        output_df.to_parquet(out_path, index=False, compression="zstd")
+    elif suffix == ".feather":
+        output_df.to_feather(out_path)
+    else:
+        _write_csv(output_df, out_path)
+    print(f"Quantified register saved to: {out_path}")
 
-        if "std" in metrics_to_include:
-            output_df.loc[mask, "SimStd"] = np.std(losses)
 
-        if "var_95" in metrics_to_include:
-            output_df.loc[mask, "SimVaR95"] = np.percentile(losses, 95)
+def _write_csv(df: pd.DataFrame, out_path: str) -> None:
+    """
+    Write a DataFrame to CSV without the index.
 
-        if "var_99" in metrics_to_include:
-            output_df.loc[mask, "SimVaR99"] = np.percentile(losses, 99)
+    Uses pyarrow's C++ CSV writer when available, which is several times
+    faster than DataFrame.to_csv on large registers. Falls back to pandas
+    when pyarrow is missing or cannot convert or write a column (e.g. mixed
+    objects, complex numbers, lists).
 
-        if "tvar_95" in metrics_to_include:
-            var95 = np.percentile(losses, 95)
-            tail = losses[losses >= var95]
-            output_df.loc[mask, "SimTVaR95"] = np.mean(tail) if len(tail) > 0 else var95
+    The two writers read back to the same values, but the text differs:
+    pyarrow quotes every string field and header, writes whole floats as
+    "1" rather than "1.0" (so an all-integral float column reads back as
+    int64) and writes booleans as "true"/"false".
+    """
+    if HAS_PYARROW:
+        try:
+            pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), out_path)
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
 
-        if "tvar_99" in metrics_to_include:
-            var99 = np.percentile(losses, 99)
-            tail = losses[losses >= var99]
-            output_df.loc[mask, "SimTVaR99"] = np.mean(tail) if len(tail) > 0 else var99
+    df.to_csv(out_path, index=False)
 
-    # Add portfolio total row
-    portfolio_losses = portfolio_df["portfolio_loss"].values
-    portfolio_row = {
-        "RiskID": "PORTFOLIO_TOTAL",
-        "Category": "Portfolio",
-        "Description": "Total portfolio loss",
-        "SimMean": np.mean(portfolio_losses),
-        "SimVaR95": np.percentile(portfolio_losses, 95),
-        "SimVaR99": np.percentile(portfolio_losses, 99),
-    }
 
-    var95 = np.percentile(portfolio_losses, 95)
-    tail95 = portfolio_losses[portfolio_losses >= var95]
-    portfolio_row["SimTVaR95"] = np.mean(tail95) if len(tail95) > 0 else var95
+def _simulation_stats(
+    register_df: pd.DataFrame, portfolio_df: pd.DataFrame, precision: str = "float64"
+) -> tuple[dict[str, float], dict[str, dict[str, float]]]:
+    """
+    Summary stats for the portfolio total and for each simulated risk.
+
+    All loss columns are summarised together from one (n_sims, 1 + n_risks)
+    matrix. Risks that are not in the register are reported in a single
+    warning and skipped.
+
+    Returns:
+        Tuple of (portfolio stats, dict mapping RiskID to risk stats)
+    """
+    risk_columns = [col for col in portfolio_df.columns if col.startswith("by_risk:")]
+    risk_ids = [col.replace("by_risk:", "") for col in risk_columns]
 
-    var99 = np.percentile(portfolio_losses, 99)
-    tail99 = portfolio_losses[portfolio_losses >= var99]
-    portfolio_row["SimTVaR99"] = np.mean(tail99) if len(tail99) > 0 else var99
+    # Find simulated risks missing from the register once, up front
+    register_ids = set(register_df["RiskID"])
+    missing = [risk_id for risk_id in risk_ids if risk_id not in register_ids]
+    if missing:
+        warnings.warn(
+            f"Risks in simulation but not in register: {', '.join(missing)}", stacklevel=3
+        )
+        risk_columns = [
+            col for col, risk_id in zip(risk_columns, risk_ids) if risk_id in register_ids
+        ]
+        risk_ids = [risk_id for risk_id in risk_ids if risk_id in register_ids]
 
-    output_df = pd.concat([output_df, pd.DataFrame([portfolio_row])], ignore_index=True)
+    # Only summarise the columns that will be written
+    loss_matrix = portfolio_df[["portfolio_loss", *risk_columns]].to_numpy(
+        dtype=_check_precision(precision)
+    )
+    records = pd.DataFrame(_summary_stats_columns(loss_matrix, precision)).to_dict(orient="records")
+    risk_stats = dict(zip(risk_ids, records[1:]))
 
-    # Save to CSV
-    output_df.to_csv(out_path, index=False)
-    print(f"Quantified register saved to: {out_path}")
+    return records[0], risk_stats
+
+
+def _append_portfolio_row(df: pd.DataFrame, portfolio_row: dict) -> pd.DataFrame:
+    """
+    Append the portfolio total row to a quantified register.
+
+    The row is built with the register's columns up front, so the concat
+    does not have to union and reindex both frames. Categorical columns stay
+    categorical, with the row's value added as a category.
+    """
+    columns = df.columns.union(list(portfolio_row), sort=False)
+    if len(columns) != len(df.columns):
+        df = df.reindex(columns=columns)
+
+    row_df = pd.DataFrame([portfolio_row], columns=columns)
+    for col in df.select_dtypes("category").columns:
+        value = portfolio_row.get(col)
+        if pd.notna(value) and value not in df[col].cat.categories:
+            df = df.assign(**{col: df[col].cat.add_categories([value])})
+        row_df[col] = pd.Categorical(row_df[col], categories=df[col].cat.categories)
+
+    return pd.concat([df, row_df], ignore_index=True, copy=False)
+
+
+def _merge_metrics(
+    register_df: pd.DataFrame, metrics: dict[str, dict[str, float]], columns: list[str]
+) -> pd.DataFrame:
+    """
+    Left-join per-risk metrics onto the register by RiskID.
+
+    Existing metric columns in the register are replaced, matching the
+    behaviour of re-quantifying an already quantified register.
+    """
+    metrics_df = pd.DataFrame.from_dict(metrics, orient="index", columns=columns)
+    metrics_df.index.name = "RiskID"
+
+    stale = [col for col in columns if col in register_df.columns]
+    if stale:
+        register_df = register_df.drop(columns=stale)
+
+    return register_df.merge(metrics_df, left_on="RiskID", right_index=True, how="left", copy=False)
 
 
 def validate_register_format(df: pd.DataFrame) -> tuple[bool, list[str]]:
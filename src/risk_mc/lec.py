@@ -4,16 +4,21 @@ Loss Exceedance Curve (LEC) utilities.
 LEC shows the probability of losses exceeding various thresholds.
 """
 
-from typing import Optional
+from typing import Optional, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from .metrics import _quantiles_sorted
+
 
 def lec_points(
-    losses: np.ndarray, probs: Optional[list[float]] = None, n_points: int = 100
+    losses: np.ndarray,
+    probs: Optional[list[float]] = None,
+    n_points: int = 100,
+    sorted_losses: Optional[np.ndarray] = None,
 ) -> pd.DataFrame:
     """
     Calculate Loss Exceedance Curve points.
@@ -23,52 +28,47 @@ def lec_points(
         probs: Optional list of specific probabilities to return (0-1)
                If None, returns n_points evenly spaced
         n_points: Number of points if probs not specified
+        sorted_losses: Optional ascending-sorted copy of losses. Callers that
+               already hold one can pass it to skip the internal sort.
 
     Returns:
         DataFrame with columns: prob (exceedance probability), loss (threshold)
         Sorted by probability descending
     """
-    sorted_losses = np.sort(losses)
+    if sorted_losses is None:
+        sorted_losses = np.sort(losses)
     n = len(sorted_losses)
 
     if probs is not None:
-        # Calculate loss at specific probabilities
-        results = []
-        for p in probs:
-            if not 0 <= p <= 1:
-                raise ValueError(f"Probability must be in [0, 1], got {p}")
+        probs_arr = np.asarray(probs, dtype=np.float64)
+        invalid = (probs_arr < 0) | (probs_arr > 1)
+        if invalid.any():
+            raise ValueError(f"Probability must be in [0, 1], got {probs_arr[invalid][0]}")
 
-            # Exceedance probability p means (1-p) percentile
-            percentile = (1 - p) * 100
-            loss_at_prob = np.percentile(sorted_losses, percentile)
-            results.append({"prob": p, "loss": loss_at_prob})
+        # Exceedance probability p means the (1-p) quantile
+        losses_at_probs = _quantiles_sorted(sorted_losses, 1 - probs_arr)
+        df = pd.DataFrame({"prob": probs_arr, "loss": losses_at_probs})
 
-        df = pd.DataFrame(results)
-    else:
-        # Generate n_points evenly spaced
-        # Create loss thresholds from min to max
-        min_loss = sorted_losses[0]
-        max_loss = sorted_losses[-1]
+        # Sort by probability descending
+        return df.sort_values("prob", ascending=False).reset_index(drop=True)
 
-        if min_loss == max_loss:
-            # All losses are the same
-            return pd.DataFrame({"prob": [1.0, 0.0], "loss": [min_loss, min_loss]})
+    # Generate n_points evenly spaced
+    # Create loss thresholds from min to max
+    min_loss = sorted_losses[0]
+    max_loss = sorted_losses[-1]
 
-        thresholds = np.linspace(min_loss, max_loss, n_points)
+    if min_loss == max_loss:
+        # All losses are the same
+        return pd.DataFrame({"prob": [1.0, 0.0], "loss": [min_loss, min_loss]})
 
-        # Calculate exceedance probability for each threshold
-        results = []
-        for threshold in thresholds:
-            n_exceeding = np.sum(sorted_losses >= threshold)
-            prob = n_exceeding / n
-            results.append({"prob": prob, "loss": threshold})
+    thresholds = np.linspace(min_loss, max_loss, n_points)
 
-        df = pd.DataFrame(results)
+    # Exceedance counts for all thresholds in one binary search over the sorted losses
+    n_below = np.searchsorted(sorted_losses, thresholds, side="left")
+    probs_exceed = (n - n_below) / n
 
-    # Sort by probability descending
-    df = df.sort_values("prob", ascending=False).reset_index(drop=True)
-
-    return df
+    # Ascending thresholds give probabilities already sorted descending
+    return pd.DataFrame({"prob": probs_exceed, "loss": thresholds})
 
 
 def plot_lec_matplotlib(
@@ -91,7 +91,8 @@ def plot_lec_matplotlib(
     Returns:
         matplotlib Figure object
     """
-    lec_df = lec_points(losses, n_points=n_points)
+    cdf = LossCDF(losses)
+    lec_df = lec_points(losses, n_points=n_points, sorted_losses=cdf.sorted_losses)
 
     fig, ax = plt.subplots(figsize=figsize)
 
@@ -100,8 +101,8 @@ def plot_lec_matplotlib(
 
     # Mark specific percentiles if requested
     if mark_percentiles:
-        for pctl in mark_percentiles:
-            loss_val = np.percentile(losses, pctl * 100)
+        marker_losses = cdf.quantile(np.asarray(mark_percentiles))
+        for pctl, loss_val in zip(mark_percentiles, marker_losses):
             prob_val = 1 - pctl
 
             ax.axvline(loss_val, color="red", linestyle="--", alpha=0.5, linewidth=1)
@@ -153,7 +154,8 @@ def plot_lec_plotly(
     Returns:
         plotly Figure object
     """
-    lec_df = lec_points(losses, n_points=n_points)
+    cdf = LossCDF(losses)
+    lec_df = lec_points(losses, n_points=n_points, sorted_losses=cdf.sorted_losses)
 
     fig = go.Figure()
 
@@ -171,8 +173,8 @@ def plot_lec_plotly(
 
     # Mark specific percentiles if requested
     if mark_percentiles:
-        for pctl in mark_percentiles:
-            loss_val = np.percentile(losses, pctl * 100)
+        marker_losses = cdf.quantile(np.asarray(mark_percentiles))
+        for pctl, loss_val in zip(mark_percentiles, marker_losses):
             prob_val = 1 - pctl
 
             # Vertical line
@@ -225,7 +227,7 @@ def return_period(losses: np.ndarray, loss_threshold: float) -> float:
     Returns:
         Return period in years
     """
-    n_exceeding = np.sum(losses >= loss_threshold)
+    n_exceeding = np.count_nonzero(losses >= loss_threshold)
     prob = n_exceeding / len(losses)
 
     if prob == 0:
@@ -245,5 +247,122 @@ def exceedance_prob(losses: np.ndarray, loss_threshold: float) -> float:
     Returns:
         Exceedance probability (0-1)
     """
-    n_exceeding = np.sum(losses >= loss_threshold)
+    n_exceeding = np.count_nonzero(losses >= loss_threshold)
     return n_exceeding / len(losses)
+
+
+class LossCDF:
+    """
+    Empirical loss distribution, sorted once for repeated queries.
+
+    Quantile queries read the order statistics directly (same linear
+    interpolation as np.percentile) and threshold queries use a binary search,
+    so any number of queries on the same losses costs a single sort. TVaR
+    queries read a suffix-sum table that is built on first use.
+
+    Args:
+        losses: Array of loss values
+    """
+
+    def __init__(self, losses: np.ndarray):
+        self.sorted_losses = np.sort(losses)
+        self.n = len(self.sorted_losses)
+        self._suffix_sums: Optional[np.ndarray] = None
+
+    def quantile(self, q: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Loss at the given non-exceedance probability (or probabilities).
+
+        Args:
+            q: Probability or array of probabilities (0-1)
+
+        Returns:
+            Loss value(s), with the same shape as q
+        """
+        q_arr = np.asarray(q, dtype=np.float64)
+        invalid = (q_arr < 0) | (q_arr > 1)
+        if invalid.any():
+            raise ValueError(f"Probability must be in [0, 1], got {q_arr[invalid].flat[0]}")
+
+        result = _quantiles_sorted(self.sorted_losses, q_arr)
+        return float(result) if result.ndim == 0 else result
+
+    def tvar(self, confidence: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Tail Value at Risk: mean of losses >= VaR at each confidence level.
+
+        Args:
+            confidence: Confidence level or array of levels (0-1)
+
+        Returns:
+            TVaR value(s), with the same shape as confidence
+        """
+        var_values = np.asarray(self.quantile(confidence))
+
+        if self._suffix_sums is None:
+            # Accumulate from the largest loss down so tail sums stay accurate
+            self._suffix_sums = np.append(np.cumsum(self.sorted_losses[::-1])[::-1], 0.0)
+
+        start = np.searchsorted(self.sorted_losses, var_values, side="left")
+        n_tail = self.n - start
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = np.where(n_tail > 0, self._suffix_sums[start] / n_tail, var_values)
+        return float(result) if result.ndim == 0 else result
+
+    def exceedance(self, loss_thresholds: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Probability that a loss is >= each threshold.
+
+        Args:
+            loss_thresholds: Loss threshold or array of thresholds
+
+        Returns:
+            Exceedance probability (0-1), with the same shape as loss_thresholds
+        """
+        n_below = np.searchsorted(self.sorted_losses, loss_thresholds, side="left")
+        return (self.n - n_below) / self.n
+
+    def return_period(self, loss_thresholds: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Return period in years for each threshold (inf if never exceeded).
+
+        Args:
+            loss_thresholds: Loss threshold or array of thresholds
+
+        Returns:
+            Return period(s), with the same shape as loss_thresholds
+        """
+        with np.errstate(divide="ignore"):
+            return 1.0 / self.exceedance(loss_thresholds)
+
+
+def exceedance_probs(losses: np.ndarray, loss_thresholds: np.ndarray) -> np.ndarray:
+    """
+    Calculate exceedance probabilities for many loss thresholds at once.
+
+    Sorts the losses once and locates every threshold with a binary search,
+    so a sweep over T thresholds costs O(N log N + T log N) rather than one
+    full scan per threshold.
+
+    Args:
+        losses: Array of loss values
+        loss_thresholds: Array of loss thresholds
+
+    Returns:
+        Array of exceedance probabilities (0-1), one per threshold
+    """
+    return LossCDF(losses).exceedance(np.asarray(loss_thresholds))
+
+
+def return_periods(losses: np.ndarray, loss_thresholds: np.ndarray) -> np.ndarray:
+    """
+    Calculate return periods for many loss thresholds at once.
+
+    Args:
+        losses: Array of annual loss values
+        loss_thresholds: Array of loss thresholds
+
+    Returns:
+        Array of return periods in years (inf where a threshold is never exceeded)
+    """
+    return LossCDF(losses).return_period(np.asarray(loss_thresholds))
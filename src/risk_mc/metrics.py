@@ -9,8 +9,13 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 
+from ._jit import HAS_NUMBA
 
-def var(losses: np.ndarray, confidence: float = 0.95) -> float:
+if HAS_NUMBA:
+    from ._jit import risk_metrics_kernel
+
+
+def var(losses: np.ndarray, confidence: float = 0.95, precision: str = "float64") -> float:
     """
     Calculate Value at Risk (VaR) at given confidence level.
 
@@ -19,6 +24,7 @@ def var(losses: np.ndarray, confidence: float = 0.95) -> float:
     Args:
         losses: Array of loss values
         confidence: Confidence level (e.g., 0.95 for 95% VaR)
+        precision: "float64" (default) or "float32" working precision
 
     Returns:
         VaR value
@@ -26,10 +32,31 @@ def var(losses: np.ndarray, confidence: float = 0.95) -> float:
     if not 0 < confidence < 1:
         raise ValueError(f"Confidence must be in (0, 1), got {confidence}")
 
-    return np.percentile(losses, confidence * 100)
+    losses = np.asarray(losses, dtype=_check_precision(precision))
+    return _partition_var(losses, confidence)[1]
+
+
+def _partition_var(losses: np.ndarray, confidence: float) -> tuple[np.ndarray, float, int, int]:
+    """
+    VaR via quickselect of the two order statistics around the VaR position.
+
+    Same linear interpolation as np.percentile, without sorting the array.
+
+    Returns:
+        Tuple of (partitioned losses, VaR, lower index, upper index)
+    """
+    losses = np.asarray(losses)
+
+    # Round-trip through percent so the position matches np.percentile(losses, confidence * 100)
+    q = confidence * 100 / 100
+    position = q * (len(losses) - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(losses) - 1)
+    partitioned = np.partition(losses, [lower, upper])
+    return partitioned, _var_sorted(partitioned, q), lower, upper
 
 
-def tvar(losses: np.ndarray, confidence: float = 0.95) -> float:
+def tvar(losses: np.ndarray, confidence: float = 0.95, precision: str = "float64") -> float:
     """
     Calculate Tail Value at Risk (TVaR) / Expected Shortfall at given confidence level.
 
@@ -39,6 +66,7 @@ def tvar(losses: np.ndarray, confidence: float = 0.95) -> float:
     Args:
         losses: Array of loss values
         confidence: Confidence level (e.g., 0.95 for 95% TVaR)
+        precision: "float64" (default) or "float32" working precision
 
     Returns:
         TVaR value
@@ -46,43 +74,214 @@ def tvar(losses: np.ndarray, confidence: float = 0.95) -> float:
     if not 0 < confidence < 1:
         raise ValueError(f"Confidence must be in (0, 1), got {confidence}")
 
-    var_threshold = var(losses, confidence)
-    tail_losses = losses[losses >= var_threshold]
+    losses = np.asarray(losses, dtype=_check_precision(precision))
+
+    # Only the two order statistics around the VaR position need to be in
+    # place; quickselect them instead of sorting or re-scanning the array
+    partitioned, var_threshold, lower, upper = _partition_var(losses, confidence)
+
+    # Everything from `upper` on is >= VaR; below it only exact ties can qualify
+    tail_losses = partitioned[upper:]
+    tail_losses = tail_losses[tail_losses >= var_threshold]
+    n_ties = 0
+    if partitioned[lower] == var_threshold:
+        n_ties = np.count_nonzero(partitioned[:upper] == var_threshold)
 
-    if len(tail_losses) == 0:
+    n_tail = len(tail_losses) + n_ties
+    if n_tail == 0:
         return var_threshold
 
-    return np.mean(tail_losses)
+    return float((np.sum(tail_losses, dtype=np.float64) + n_ties * var_threshold) / n_tail)
+
+
+# Quantile levels reported by summary(), and their interpolation plans keyed by sample count
+_SUMMARY_QS = np.array([0.5, 0.9, 0.95, 0.99])
+_PCTL_IDX_CACHE: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+_PCTL_IDX_CACHE_SIZE = 64
+
+
+def _interpolation_plan(qs, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Order-statistic indices (lower, upper) and weights for linear quantiles of n values."""
+    positions = np.asarray(qs, dtype=np.float64) * (n - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    return lower, upper, positions - lower
+
+
+def _summary_plan(n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cached interpolation plan for the summary quantiles."""
+    plan = _PCTL_IDX_CACHE.get(n)
+    if plan is None:
+        if len(_PCTL_IDX_CACHE) >= _PCTL_IDX_CACHE_SIZE:
+            _PCTL_IDX_CACHE.clear()
+        plan = _PCTL_IDX_CACHE[n] = _interpolation_plan(_SUMMARY_QS, n)
+    return plan
 
 
-def summary(losses: np.ndarray, label: str = "Loss") -> pd.Series:
+def _lerp(below: np.ndarray, above: np.ndarray, gamma: np.ndarray) -> np.ndarray:
+    """Same two-sided lerp as numpy's percentile, for exact numerical agreement."""
+    diff = above - below
+    return np.where(gamma >= 0.5, above - diff * (1 - gamma), below + diff * gamma)
+
+
+def _quantiles_sorted(sorted_losses: np.ndarray, qs) -> np.ndarray:
+    """
+    Linearly interpolated quantiles of an ascending-sorted array.
+
+    Matches np.percentile's default ("linear") method, but reads the order
+    statistics directly instead of re-partitioning the data for each quantile.
+    """
+    lower, upper, gamma = _interpolation_plan(qs, len(sorted_losses))
+    return _lerp(sorted_losses[lower], sorted_losses[upper], gamma)
+
+
+def _var_sorted(sorted_losses: np.ndarray, confidence: float) -> float:
+    """VaR from an ascending-sorted loss array."""
+    return float(_quantiles_sorted(sorted_losses, confidence))
+
+
+def _tvar_sorted(
+    sorted_losses: np.ndarray, confidence: float, var_threshold: Optional[float] = None
+) -> float:
+    """TVaR from an ascending-sorted loss array (mean of losses >= VaR)."""
+    if var_threshold is None:
+        var_threshold = _var_sorted(sorted_losses, confidence)
+
+    # Tail is a suffix of the sorted array, no boolean mask needed
+    start = np.searchsorted(sorted_losses, var_threshold, side="left")
+    if start == len(sorted_losses):
+        return var_threshold
+
+    return float(np.mean(sorted_losses[start:], dtype=np.float64))
+
+
+def _summary_stats(losses: np.ndarray) -> dict[str, float]:
+    """Summary statistics computed from a single sort of the loss array."""
+    if HAS_NUMBA and len(losses) > 0:
+        # One compiled pass after the sort; avoids a dozen NumPy dispatches,
+        # which dominate for the small arrays scenario runs summarize
+        stats = _summary_stats_columns_jit(np.asarray(losses)[np.newaxis, :])
+        return {name: values[0] for name, values in stats.items()}
+
+    sorted_losses = np.sort(losses)
+    lower, upper, gamma = _summary_plan(len(sorted_losses))
+    p50, p90, p95, p99 = _lerp(sorted_losses[lower], sorted_losses[upper], gamma)
+
+    return {
+        "mean": np.mean(losses, dtype=np.float64),
+        "median": p50,
+        "std": np.std(losses, dtype=np.float64),
+        "min": sorted_losses[0],
+        "max": sorted_losses[-1],
+        "p50": p50,
+        "p90": p90,
+        "p95": p95,
+        "p99": p99,
+        "var_95": p95,
+        "var_99": p99,
+        "tvar_95": _tvar_sorted(sorted_losses, 0.95, p95),
+        "tvar_99": _tvar_sorted(sorted_losses, 0.99, p99),
+    }
+
+
+_PRECISIONS = ("float64", "float32")
+
+
+def _check_precision(precision: str) -> np.dtype:
+    """Validate a precision option and return the matching dtype."""
+    if precision not in _PRECISIONS:
+        raise ValueError(f"precision must be one of {_PRECISIONS}, got {precision!r}")
+    return np.dtype(precision)
+
+
+def _summary_stats_columns(
+    loss_matrix: np.ndarray, precision: str = "float64"
+) -> dict[str, np.ndarray]:
+    """
+    Column-wise _summary_stats for an (n_sims, n_risks) loss matrix.
+
+    All columns are sorted in one call and every statistic is computed for all
+    columns at once, so each entry of the result has one value per column.
+    With precision="float32" the losses are sorted and scanned in single
+    precision; sums are still accumulated and all results returned as float64.
+    """
+    # Work on (n_risks, n_sims) so each risk's losses are contiguous
+    loss_columns = np.asarray(loss_matrix.T, dtype=_check_precision(precision))
+
+    if HAS_NUMBA:
+        return _summary_stats_columns_jit(loss_columns)
+
+    sorted_losses = np.sort(loss_columns, axis=1)
+    lower, upper, gamma = _summary_plan(sorted_losses.shape[1])
+    p50, p90, p95, p99 = _lerp(sorted_losses[:, lower], sorted_losses[:, upper], gamma).T
+
+    def tail_mean(threshold: np.ndarray, split: int) -> np.ndarray:
+        # Entries from `split` on are >= VaR; before it only exact ties qualify
+        threshold = threshold[:, np.newaxis]
+        tail = sorted_losses[:, split:]
+        in_tail = tail >= threshold
+        n_ties = np.count_nonzero(sorted_losses[:, :split] == threshold, axis=1)
+        n_tail = np.count_nonzero(in_tail, axis=1) + n_ties
+        tail_sum = np.where(in_tail, tail, 0.0).sum(axis=1, dtype=np.float64)
+        tail_sum += n_ties * threshold[:, 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(n_tail > 0, tail_sum / n_tail, threshold[:, 0])
+
+    return {
+        "mean": np.mean(loss_columns, axis=1, dtype=np.float64),
+        "median": p50,
+        "std": np.std(loss_columns, axis=1, dtype=np.float64),
+        "min": sorted_losses[:, 0].astype(np.float64),
+        "max": sorted_losses[:, -1].astype(np.float64),
+        "p50": p50,
+        "p90": p90,
+        "p95": p95,
+        "p99": p99,
+        "var_95": p95,
+        "var_99": p99,
+        "tvar_95": tail_mean(p95, upper[2]),
+        "tvar_99": tail_mean(p99, upper[3]),
+    }
+
+
+def _summary_stats_columns_jit(loss_columns: np.ndarray) -> dict[str, np.ndarray]:
+    """_summary_stats_columns using the compiled per-risk kernel on (n_risks, n_sims) losses."""
+    sorted_columns = np.sort(loss_columns, axis=1)
+    out = risk_metrics_kernel(sorted_columns, _SUMMARY_QS)
+    mean, std, min_loss, max_loss, p50, p90, p95, p99, _, _, tvar_95, tvar_99 = out.T
+
+    return {
+        "mean": mean,
+        "median": p50,
+        "std": std,
+        "min": min_loss,
+        "max": max_loss,
+        "p50": p50,
+        "p90": p90,
+        "p95": p95,
+        "p99": p99,
+        "var_95": p95,
+        "var_99": p99,
+        "tvar_95": tvar_95,
+        "tvar_99": tvar_99,
+    }
+
+
+def summary(losses: np.ndarray, label: str = "Loss", precision: str = "float64") -> pd.Series:
     """
     Generate comprehensive summary statistics for loss distribution.
 
     Args:
         losses: Array of loss values
         label: Label for the series name
+        precision: "float64" (default) or "float32". float32 halves the bytes
+            sorted; sums are still accumulated in float64.
 
     Returns:
-        pandas Series with summary statistics
+        pandas Series with summary statistics (float64)
     """
-    stats = {
-        "mean": np.mean(losses),
-        "median": np.median(losses),
-        "std": np.std(losses),
-        "min": np.min(losses),
-        "max": np.max(losses),
-        "p50": np.percentile(losses, 50),
-        "p90": np.percentile(losses, 90),
-        "p95": np.percentile(losses, 95),
-        "p99": np.percentile(losses, 99),
-        "var_95": var(losses, 0.95),
-        "var_99": var(losses, 0.99),
-        "tvar_95": tvar(losses, 0.95),
-        "tvar_99": tvar(losses, 0.99),
-    }
-
-    return pd.Series(stats, name=label)
+    losses = np.asarray(losses, dtype=_check_precision(precision))
+    return pd.Series(_summary_stats(losses), name=label, dtype=np.float64)
 
 
 def percentiles(losses: np.ndarray, probs: list[float]) -> dict[float, float]:
@@ -96,13 +295,14 @@ def percentiles(losses: np.ndarray, probs: list[float]) -> dict[float, float]:
     Returns:
         Dictionary mapping probability to loss value
     """
-    result = {}
-    for p in probs:
-        if not 0 <= p <= 1:
-            raise ValueError(f"Probability must be in [0, 1], got {p}")
-        result[p] = np.percentile(losses, p * 100)
+    probs_arr = np.asarray(probs, dtype=np.float64)
+    invalid = (probs_arr < 0) | (probs_arr > 1)
+    if invalid.any():
+        raise ValueError(f"Probability must be in [0, 1], got {probs_arr[invalid][0]}")
 
-    return result
+    # One validation and one partition pass for all probabilities
+    values = np.percentile(losses, probs_arr * 100)
+    return dict(zip(probs, values.tolist()))
 
 
 def expected_loss(losses: np.ndarray) -> float:
@@ -119,7 +319,9 @@ def expected_loss(losses: np.ndarray) -> float:
 
 
 def portfolio_summary(
-    portfolio_df: pd.DataFrame, risk_columns: Optional[list[str]] = None
+    portfolio_df: pd.DataFrame,
+    risk_columns: Optional[list[str]] = None,
+    precision: str = "float64",
 ) -> pd.DataFrame:
     """
     Generate summary statistics for portfolio and individual risks.
@@ -127,6 +329,10 @@ def portfolio_summary(
     Args:
         portfolio_df: Output from simulate_portfolio
         risk_columns: List of risk column names (if None, auto-detect)
+        precision: "float64" (default) or "float32". float32 halves the size of
+            the working copy that is sorted and scanned, at the cost of ~7
+            significant digits in the percentiles; it avoids a conversion pass
+            when the simulated losses are already float32.
 
     Returns:
         DataFrame with summary stats for each risk and portfolio
@@ -134,19 +340,13 @@ def portfolio_summary(
     if risk_columns is None:
         risk_columns = [col for col in portfolio_df.columns if col.startswith("by_risk:")]
 
-    summaries = []
+    # Portfolio total first, then individual risks, as one (n_sims, 1 + n_risks) matrix
+    loss_matrix = portfolio_df[["portfolio_loss", *risk_columns]].to_numpy(
+        dtype=_check_precision(precision)
+    )
+    labels = ["Portfolio"] + [col.replace("by_risk:", "") for col in risk_columns]
 
-    # Portfolio total
-    portfolio_summary_stats = summary(portfolio_df["portfolio_loss"].values, "Portfolio")
-    summaries.append(portfolio_summary_stats)
-
-    # Individual risks
-    for col in risk_columns:
-        risk_id = col.replace("by_risk:", "")
-        risk_summary = summary(portfolio_df[col].values, risk_id)
-        summaries.append(risk_summary)
-
-    return pd.DataFrame(summaries)
+    return pd.DataFrame(_summary_stats_columns(loss_matrix, precision), index=labels)
 
 
 def contribution_analysis(portfolio_df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
@@ -160,28 +360,27 @@ def contribution_analysis(portfolio_df: pd.DataFrame, top_n: int = 10) -> pd.Dat
     Returns:
         DataFrame with risk contributions sorted by mean loss
     """
-    contributions = []
-
     risk_columns = [col for col in portfolio_df.columns if col.startswith("by_risk:")]
+    loss_matrix = portfolio_df[risk_columns].to_numpy(dtype=np.float64)
 
-    for col in risk_columns:
-        risk_id = col.replace("by_risk:", "")
-        losses = portfolio_df[col].values
+    mean_loss = np.mean(loss_matrix, axis=0)
+    portfolio_mean = np.mean(portfolio_df["portfolio_loss"])
 
-        contributions.append(
-            {
-                "risk_id": risk_id,
-                "mean_loss": np.mean(losses),
-                "std_loss": np.std(losses),
-                "var_95": var(losses, 0.95),
-                "contribution_pct": np.mean(losses) / np.mean(portfolio_df["portfolio_loss"]) * 100,
-            }
-        )
+    # Rank on the mean first; spread metrics are only needed for the top risks
+    df = pd.DataFrame(
+        {
+            "risk_id": [col.replace("by_risk:", "") for col in risk_columns],
+            "mean_loss": mean_loss,
+        }
+    ).nlargest(top_n, "mean_loss")
 
-    df = pd.DataFrame(contributions)
-    df = df.sort_values("mean_loss", ascending=False)
+    top_losses = loss_matrix[:, df.index.to_numpy()]
 
-    return df.head(top_n)
+    return df.assign(
+        std_loss=np.std(top_losses, axis=0),
+        var_95=np.percentile(top_losses.T, 95, axis=1),
+        contribution_pct=df["mean_loss"].to_numpy() / portfolio_mean * 100,
+    )
 
 
 def correlation_matrix(portfolio_df: pd.DataFrame) -> pd.DataFrame:
@@ -198,12 +397,46 @@ def correlation_matrix(portfolio_df: pd.DataFrame) -> pd.DataFrame:
         Correlation matrix DataFrame
     """
     risk_columns = [col for col in portfolio_df.columns if col.startswith("by_risk:")]
-    risk_data = portfolio_df[risk_columns]
+    risk_ids = [col.replace("by_risk:", "") for col in risk_columns]
+    loss_matrix = portfolio_df[risk_columns].to_numpy(dtype=np.float64)
+
+    # One BLAS product instead of DataFrame.corr's pairwise loop. Simulated
+    # losses contain no NaNs, so pairwise NaN handling is not needed; risks
+    # with zero variance still come out as NaN, as with DataFrame.corr.
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.corrcoef(loss_matrix, rowvar=False)
 
-    # Rename columns to remove prefix
-    risk_data = risk_data.rename(columns=lambda x: x.replace("by_risk:", ""))
+    return pd.DataFrame(np.atleast_2d(corr), index=risk_ids, columns=risk_ids)
 
-    return risk_data.corr()
+
+def _tail_contributions(
+    loss_matrix: np.ndarray, portfolio_losses: np.ndarray, q: float
+) -> np.ndarray:
+    """
+    Mean loss of each risk column over the portfolio tail at VaR(q).
+
+    Args:
+        loss_matrix: Array of shape (n_sims, n_risks)
+        portfolio_losses: Array of portfolio total losses
+        q: VaR confidence level
+
+    Returns:
+        Array of per-risk contributions (0.0 where there is no signal)
+    """
+    # Calculate portfolio VaR and the tail scenarios it defines
+    portfolio_var = var(portfolio_losses, q)
+    tail_mask = portfolio_losses >= portfolio_var
+    n_tail = np.count_nonzero(tail_mask)
+
+    # A tail that is empty or covers every scenario carries no signal
+    if not 0 < n_tail < len(tail_mask):
+        return np.zeros(loss_matrix.shape[1])
+
+    # Mean loss of every risk within the portfolio tail, in one reduction;
+    # risks that never vary contribute nothing
+    tail_means = loss_matrix[tail_mask].mean(axis=0)
+    varies = np.ptp(loss_matrix, axis=0) > 0
+    return np.where(varies, tail_means, 0.0)
 
 
 def marginal_contribution_to_var(
@@ -212,8 +445,9 @@ def marginal_contribution_to_var(
     """
     Calculate each risk's marginal contribution to portfolio VaR.
 
-    Uses Shapley-style approximation: correlate tail indicator with risk loss.
-    This measures how much each risk contributes to tail events.
+    Uses Shapley-style approximation: each risk's mean loss over the
+    scenarios where the portfolio loss reaches VaR. This measures how much
+    each risk contributes to tail events.
 
     Args:
         by_risk_losses: Dictionary mapping risk ID to loss array
@@ -223,35 +457,14 @@ def marginal_contribution_to_var(
     Returns:
         Dictionary mapping risk ID to dVaR contribution
     """
-    # Calculate portfolio VaR
-    portfolio_var = var(portfolio_losses, q)
-
-    # Create tail indicator (1 if in tail, 0 otherwise)
-    tail_indicator = (portfolio_losses >= portfolio_var).astype(float)
-
-    contributions = {}
-
-    for risk_id, risk_losses in by_risk_losses.items():
-        # Skip 'portfolio' key if present
-        if risk_id == "portfolio":
-            continue
-
-        # Calculate correlation between tail indicator and risk loss
-        # This measures how much this risk drives tail events
-        if np.std(tail_indicator) > 0 and np.std(risk_losses) > 0:
-            np.corrcoef(tail_indicator, risk_losses)[0, 1]
-
-            # Scale by risk's contribution to portfolio
-            # dVaR ≈ correlation * std(risk) * tail_indicator_mean
-            mean_tail_contribution = np.mean(risk_losses[tail_indicator == 1])
+    risk_ids = [risk_id for risk_id in by_risk_losses if risk_id != "portfolio"]
+    if not risk_ids:
+        return {}
 
-            contributions[risk_id] = (
-                mean_tail_contribution if not np.isnan(mean_tail_contribution) else 0.0
-            )
-        else:
-            contributions[risk_id] = 0.0
+    loss_matrix = np.column_stack([by_risk_losses[risk_id] for risk_id in risk_ids])
+    contributions = _tail_contributions(loss_matrix, portfolio_losses, q)
 
-    return contributions
+    return dict(zip(risk_ids, contributions.tolist()))
 
 
 def tornado_data(
@@ -276,30 +489,23 @@ def tornado_data(
     Returns:
         DataFrame with columns: risk_id, category, mean_loss, dvar, rank_by_mean, rank_by_dvar
     """
-    # Calculate marginal VaR contributions
-    dvar_contrib = marginal_contribution_to_var(by_risk_losses, portfolio_losses, q)
-
-    # Build results
-    results = []
-
-    for risk_id, risk_losses in by_risk_losses.items():
-        if risk_id == "portfolio":
-            continue
-
-        # Get category from register
-        risk_row = register_df[register_df["RiskID"] == risk_id]
-        category = risk_row["Category"].iloc[0] if len(risk_row) > 0 else "Unknown"
-
-        results.append(
-            {
-                "risk_id": risk_id,
-                "category": category,
-                "mean_loss": np.mean(risk_losses),
-                "dvar": dvar_contrib.get(risk_id, 0.0),
-            }
-        )
-
-    df = pd.DataFrame(results)
+    risk_ids = [risk_id for risk_id in by_risk_losses if risk_id != "portfolio"]
+
+    # Category lookup built once (first row wins for duplicate IDs)
+    register_rows = register_df.drop_duplicates("RiskID")
+    categories = dict(zip(register_rows["RiskID"], register_rows["Category"]))
+
+    # Mean loss and marginal VaR contribution for all risks from one matrix
+    loss_matrix = np.column_stack([by_risk_losses[risk_id] for risk_id in risk_ids])
+
+    df = pd.DataFrame(
+        {
+            "risk_id": risk_ids,
+            "category": [categories.get(risk_id, "Unknown") for risk_id in risk_ids],
+            "mean_loss": loss_matrix.mean(axis=0),
+            "dvar": _tail_contributions(loss_matrix, portfolio_losses, q),
+        }
+    )
 
     # Add rankings
     df["rank_by_mean"] = df["mean_loss"].rank(ascending=False)
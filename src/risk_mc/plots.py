@@ -10,7 +10,68 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from scipy import stats
+from scipy import signal
+
+# Grid resolution for the binned KDE
+_KDE_GRID_SIZE = 4096
+
+
+def _fast_kde(losses: np.ndarray, x_grid: np.ndarray) -> np.ndarray:
+    """
+    Binned Gaussian KDE evaluated on x_grid.
+
+    Bins the losses onto a fine regular grid and convolves with the Gaussian
+    kernel by FFT, which costs O(N + G log G) instead of the O(N * len(x_grid))
+    of scipy.stats.gaussian_kde. Uses the same bandwidth (Scott's rule on the
+    sample standard deviation), so the curve matches gaussian_kde closely.
+
+    Args:
+        losses: Array of loss values
+        x_grid: Points at which to evaluate the density
+
+    Returns:
+        Density estimates at x_grid (all zero if the losses do not vary)
+    """
+    n = len(losses)
+    bandwidth = np.std(losses, ddof=1) * n ** (-1 / 5) if n > 1 else 0.0
+    if not bandwidth > 0:
+        return np.zeros(len(x_grid))
+
+    # Pad the grid so kernel mass near the extremes is not cut off
+    lo = min(losses.min(), x_grid.min()) - 4 * bandwidth
+    hi = max(losses.max(), x_grid.max()) + 4 * bandwidth
+    counts, edges = np.histogram(losses, bins=_KDE_GRID_SIZE, range=(lo, hi))
+    dx = edges[1] - edges[0]
+    centers = edges[:-1] + dx / 2
+
+    # Kernel sampled at whole-bin offsets, truncated at 4 bandwidths
+    half_width = min(int(np.ceil(4 * bandwidth / dx)), _KDE_GRID_SIZE)
+    offsets = np.arange(-half_width, half_width + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    density = signal.fftconvolve(counts / n, kernel, mode="same")
+    return np.interp(x_grid, centers, np.clip(density, 0.0, None))
+
+
+def _plot_sample(losses: np.ndarray, max_plot_points: Optional[int]) -> np.ndarray:
+    """
+    Uniform random subsample of losses for rendering.
+
+    The sample is seeded so the same losses always draw the same figure.
+
+    Args:
+        losses: Array of loss values
+        max_plot_points: Maximum points to keep (None keeps all)
+
+    Returns:
+        losses itself if small enough, otherwise a subsample of max_plot_points
+    """
+    losses = np.asarray(losses)
+    if max_plot_points is None or len(losses) <= max_plot_points:
+        return losses
+
+    idx = np.random.default_rng(0).choice(len(losses), max_plot_points, replace=False)
+    return losses[idx]
 
 
 def loss_histogram(
@@ -20,6 +81,7 @@ def loss_histogram(
     figsize: tuple[int, int] = (10, 6),
     kde: bool = True,
     mark_percentiles: Optional[list] = None,
+    max_plot_points: Optional[int] = None,
 ) -> plt.Figure:
     """
     Plot loss distribution histogram with optional KDE overlay.
@@ -31,16 +93,23 @@ def loss_histogram(
         figsize: Figure size (width, height)
         kde: Whether to overlay kernel density estimate
         mark_percentiles: Optional list of percentiles to mark (e.g., [0.95, 0.99])
+        max_plot_points: Optionally draw the histogram and KDE from a random
+            subsample of at most this many losses (None, the default, draws
+            all; subsampling thins out the tail bins). Percentiles always use
+            the full array
 
     Returns:
         matplotlib Figure object
     """
     fig, ax = plt.subplots(figsize=figsize)
+    losses_plot = _plot_sample(losses, max_plot_points)
+    loss_range = (losses.min(), losses.max())
 
-    # Plot histogram
+    # Plot histogram over the full loss range
     n, bins_edges, patches = ax.hist(
-        losses,
+        losses_plot,
         bins=bins,
+        range=loss_range,
         density=True,
         alpha=0.7,
         color="#2E86AB",
@@ -50,14 +119,13 @@ def loss_histogram(
 
     # Overlay KDE if requested
     if kde:
-        kde_obj = stats.gaussian_kde(losses)
-        x_range = np.linspace(losses.min(), losses.max(), 200)
-        ax.plot(x_range, kde_obj(x_range), "r-", linewidth=2, label="KDE")
+        x_range = np.linspace(*loss_range, 200)
+        ax.plot(x_range, _fast_kde(losses_plot, x_range), "r-", linewidth=2, label="KDE")
 
     # Mark percentiles
     if mark_percentiles:
-        for pctl in mark_percentiles:
-            pctl_val = np.percentile(losses, pctl * 100)
+        pctl_vals = np.percentile(losses, [pctl * 100 for pctl in mark_percentiles])
+        for pctl, pctl_val in zip(mark_percentiles, pctl_vals):
             ax.axvline(
                 pctl_val,
                 color="red",
@@ -89,6 +157,9 @@ def loss_histogram_plotly(
     """
     Plot interactive loss distribution histogram using plotly.
 
+    The histogram is binned here with np.histogram over all losses, so the
+    figure carries one bar per bin rather than every simulated loss.
+
     Args:
         losses: Array of loss values
         title: Plot title
@@ -101,21 +172,22 @@ def loss_histogram_plotly(
     fig = go.Figure()
 
     # Histogram
+    density, edges = np.histogram(losses, bins=bins, density=True)
     fig.add_trace(
-        go.Histogram(
-            x=losses,
-            nbinsx=bins,
+        go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=density,
+            width=np.diff(edges),
             name="Loss Distribution",
             marker_color="#2E86AB",
             opacity=0.7,
-            histnorm="probability density",
         )
     )
 
     # Mark percentiles
     if mark_percentiles:
-        for pctl in mark_percentiles:
-            pctl_val = np.percentile(losses, pctl * 100)
+        pctl_vals = np.percentile(losses, [pctl * 100 for pctl in mark_percentiles])
+        for pctl, pctl_val in zip(mark_percentiles, pctl_vals):
             fig.add_vline(
                 x=pctl_val,
                 line_dash="dash",
@@ -198,27 +270,18 @@ def frequency_severity_scatter(
     """
     fig, ax = plt.subplots(figsize=figsize)
 
-    frequencies = []
-    mean_severities = []
-    risk_ids = []
-
-    for _, risk in register_df.iterrows():
-        risk_id = risk["RiskID"]
-        col_name = f"by_risk:{risk_id}"
-
-        if col_name in portfolio_df.columns:
-            losses = portfolio_df[col_name].values
-
-            # Estimate frequency as proportion of non-zero losses
-            freq = np.sum(losses > 0) / len(losses)
-
-            # Estimate mean severity as mean of non-zero losses
-            non_zero = losses[losses > 0]
-            mean_sev = np.mean(non_zero) if len(non_zero) > 0 else 0
+    risk_ids = [
+        risk_id for risk_id in register_df["RiskID"] if f"by_risk:{risk_id}" in portfolio_df.columns
+    ]
+    loss_matrix = portfolio_df[[f"by_risk:{risk_id}" for risk_id in risk_ids]].to_numpy(
+        dtype=np.float64
+    )
 
-            frequencies.append(freq)
-            mean_severities.append(mean_sev)
-            risk_ids.append(risk_id)
+    # Frequency as proportion of non-zero losses, severity as their mean
+    nonzero = loss_matrix > 0
+    n_nonzero = np.count_nonzero(nonzero, axis=0)
+    frequencies = n_nonzero / len(loss_matrix)
+    mean_severities = np.where(nonzero, loss_matrix, 0.0).sum(axis=0) / np.maximum(n_nonzero, 1)
 
     ax.scatter(
         mean_severities,
@@ -256,7 +319,10 @@ def frequency_severity_scatter(
 
 
 def compare_distributions(
-    distributions: dict, title: str = "Distribution Comparison", figsize: tuple[int, int] = (12, 6)
+    distributions: dict,
+    title: str = "Distribution Comparison",
+    figsize: tuple[int, int] = (12, 6),
+    max_plot_points: Optional[int] = None,
 ) -> plt.Figure:
     """
     Compare multiple loss distributions side by side.
@@ -265,6 +331,8 @@ def compare_distributions(
         distributions: Dictionary mapping label to loss array
         title: Plot title
         figsize: Figure size
+        max_plot_points: Optionally draw each histogram from a random subsample
+            of at most this many losses (None, the default, draws all)
 
     Returns:
         matplotlib Figure object
@@ -275,7 +343,15 @@ def compare_distributions(
         axes = [axes]
 
     for ax, (label, losses) in zip(axes, distributions.items()):
-        ax.hist(losses, bins=50, density=True, alpha=0.7, color="#2E86AB", edgecolor="black")
+        ax.hist(
+            _plot_sample(losses, max_plot_points),
+            bins=50,
+            range=(np.min(losses), np.max(losses)),
+            density=True,
+            alpha=0.7,
+            color="#2E86AB",
+            edgecolor="black",
+        )
         ax.set_xlabel("Loss ($)", fontsize=10, fontweight="bold")
         ax.set_title(label, fontsize=12)
         ax.grid(True, alpha=0.3, linestyle="--")
@@ -4,16 +4,45 @@ Core Monte Carlo simulation functions for risk quantification.
 Implements frequency/severity modeling with control effectiveness.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import numpy as np
 import pandas as pd
 
+from ._jit import HAS_NUMBA
 from .distributions import sample_frequency, sample_severity
+from .metrics import _check_precision
+
+if HAS_NUMBA:
+    from ._jit import event_sums_kernel
+
+# Register columns read by the simulation, in _simulate_risk argument order,
+# with the defaults used when a column is absent
+_RISK_PARAMS = {
+    "FrequencyModel": "Poisson",
+    "FreqParam1": 1.0,
+    "FreqParam2": None,
+    "SeverityModel": "Lognormal",
+    "SevParam1": 10.0,
+    "SevParam2": 1.0,
+    "SevParam3": None,
+    "ResidualFactor": 1.0,
+    "ControlEffectiveness": 0.0,
+}
+
+# Simulations per tile when summing risks into the portfolio total; a float64
+# tile (128 KB) stays cache-resident while every risk is added to it
+_TOTAL_TILE = 16_384
 
 
 def simulate_annual_loss(
-    risk_row: pd.Series, n_sims: int = 50_000, seed: Optional[int] = None
+    risk_row: pd.Series,
+    n_sims: int = 50_000,
+    seed: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+    precision: str = "float64",
 ) -> np.ndarray:
     """
     Simulate annual losses for a single risk using frequency/severity approach.
@@ -36,61 +65,88 @@ def simulate_annual_loss(
             - ControlEffectiveness: optional, fraction reduced (0-1)
             - ResidualFactor: multiplier for severity after controls
         n_sims: Number of Monte Carlo simulations
-        seed: Random seed for reproducibility
+        seed: Random seed for reproducibility (ignored when rng is given)
+        rng: Random number generator to draw from (optional)
+        precision: "float64" (default) or "float32" for the returned losses
 
     Returns:
         Array of shape (n_sims,) with annual loss values
     """
-    rng = np.random.default_rng(seed)
+    dtype = _check_precision(precision)
+    if rng is None:
+        rng = np.random.default_rng(seed)
 
     # Extract parameters with defaults
-    freq_model = risk_row.get("FrequencyModel", "Poisson")
-    freq_param1 = risk_row.get("FreqParam1", 1.0)
-    freq_param2 = risk_row.get("FreqParam2", None)
-
-    sev_model = risk_row.get("SeverityModel", "Lognormal")
-    sev_param1 = risk_row.get("SevParam1", 10.0)
-    sev_param2 = risk_row.get("SevParam2", 1.0)
-    sev_param3 = risk_row.get("SevParam3", None)
+    params = [risk_row.get(col, default) for col, default in _RISK_PARAMS.items()]
+    return _simulate_risk(*params, n_sims=n_sims, rng=rng).astype(dtype, copy=False)
+
+
+def _simulate_risk(
+    freq_model: str,
+    freq_param1: float,
+    freq_param2: Optional[float],
+    sev_model: str,
+    sev_param1: float,
+    sev_param2: float,
+    sev_param3: Optional[float],
+    residual_factor: float,
+    control_eff: float,
+    n_sims: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Simulate annual losses for one risk from its scalar parameters.
 
-    residual_factor = risk_row.get("ResidualFactor", 1.0)
-    control_eff = risk_row.get("ControlEffectiveness", 0.0)
+    Core of simulate_annual_loss, taking plain values so that
+    simulate_portfolio can feed it straight from register columns without
+    building a Series per row.
 
+    Returns:
+        Array of shape (n_sims,) with annual loss values
+    """
     # Validate parameters
     if not 0 <= residual_factor <= 1:
         raise ValueError(f"ResidualFactor must be in [0, 1], got {residual_factor}")
     if not 0 <= control_eff <= 1:
         raise ValueError(f"ControlEffectiveness must be in [0, 1], got {control_eff}")
 
+    # Apply controls: residual factor directly multiplies severity
+    # ControlEffectiveness can be used for additional reduction if needed
+    # Formula: effective_loss = severity * residual_factor * (1 - control_eff)
+    # Both factors are per-risk constants, so they fold into one scale that is
+    # applied to the annual totals rather than to every event.
+    scale = float(residual_factor) * (1.0 - float(control_eff))
+
     # Sample frequency (event counts per simulation)
     event_counts = sample_frequency(freq_model, freq_param1, freq_param2, n_sims, rng)
 
-    # Initialize annual losses
-    annual_losses = np.zeros(n_sims)
+    total_events = int(event_counts.sum())
+    if total_events == 0:
+        return np.zeros(n_sims)
 
-    # For each simulation, sample severities and sum
-    for i in range(n_sims):
-        n_events = int(event_counts[i])
+    # Sample severities for every event of every simulation in one draw;
+    # events are laid out simulation by simulation, in the order of event_counts
+    severities = sample_severity(sev_model, sev_param1, sev_param2, sev_param3, total_events, rng)
 
-        if n_events > 0:
-            # Sample severities for all events in this simulation
-            severities = sample_severity(
-                sev_model, sev_param1, sev_param2, sev_param3, n_events, rng
-            )
-
-            # Apply controls: residual factor directly multiplies severity
-            # ControlEffectiveness can be used for additional reduction if needed
-            # Formula: effective_loss = severity * residual_factor * (1 - control_eff)
-            effective_severities = severities * residual_factor * (1 - control_eff)
+    # Sum each simulation's events to get annual loss
+    if HAS_NUMBA:
+        annual_losses = event_sums_kernel(event_counts, severities)
+    else:
+        sim_index = np.repeat(np.arange(n_sims), event_counts)
+        annual_losses = np.bincount(sim_index, weights=severities, minlength=n_sims)
 
-            # Sum to get annual loss
-            annual_losses[i] = np.sum(effective_severities)
+    if scale != 1.0:
+        annual_losses *= scale
 
     return annual_losses
 
 
 def simulate_portfolio(
-    register_df: pd.DataFrame, n_sims: int = 50_000, seed: Optional[int] = None
+    register_df: pd.DataFrame,
+    n_sims: int = 50_000,
+    seed: Optional[int] = None,
+    precision: str = "float64",
+    n_jobs: int = 1,
 ) -> pd.DataFrame:
     """
     Simulate annual losses for entire risk portfolio.
@@ -100,44 +156,116 @@ def simulate_portfolio(
             Must contain columns for simulate_annual_loss
         n_sims: Number of Monte Carlo simulations
         seed: Random seed for reproducibility
+        precision: "float64" (default) or "float32" storage for the loss
+            columns. float32 halves the result's memory; losses are still
+            simulated, and the total accumulated, in float64.
+        n_jobs: Number of threads simulating risks concurrently (-1 for one
+            per CPU). Each risk has its own random stream and NumPy releases
+            the GIL while sampling, so results are identical for any n_jobs.
 
     Returns:
         DataFrame with columns:
             - portfolio_loss: total portfolio loss per simulation
             - by_risk:<RiskID>: individual risk loss per simulation
     """
+    risk_ids, losses = _simulate_portfolio_array(register_df, n_sims, seed, precision, n_jobs)
+
+    # Transposed view over the same buffer, so no per-column copies
+    columns = ["portfolio_loss", *(f"by_risk:{risk_id}" for risk_id in risk_ids)]
+    return pd.DataFrame(losses.T, columns=columns, copy=False)
+
+
+def _simulate_portfolio_array(
+    register_df: pd.DataFrame,
+    n_sims: int,
+    seed: Optional[int] = None,
+    precision: str = "float64",
+    n_jobs: int = 1,
+) -> tuple[list, np.ndarray]:
+    """
+    Simulate the portfolio into one array, without building a DataFrame.
+
+    Core of simulate_portfolio (same arguments and streams).
+
+    Returns:
+        Tuple of (risk IDs, losses) where losses has shape (1 + len(risk IDs),
+        n_sims): row 0 is the portfolio total and row i + 1 is risk_ids[i]
+    """
+    dtype = _check_precision(precision)
     if len(register_df) == 0:
         raise ValueError("Risk register is empty")
 
-    # Initialize RNG for reproducible splits
-    if seed is not None:
-        base_rng = np.random.default_rng(seed)
-        # Generate unique seeds for each risk
-        risk_seeds = base_rng.integers(0, 2**31, size=len(register_df))
+    # Independent stream for each risk, spawned from the portfolio seed
+    risk_seeds = _risk_seeds(len(register_df), seed)
+
+    # Pull each parameter column out once instead of building a Series per row
+    n_risks = len(register_df)
+    param_columns = [
+        register_df[col].to_numpy() if col in register_df.columns else [default] * n_risks
+        for col, default in _RISK_PARAMS.items()
+    ]
+    if "RiskID" in register_df.columns:
+        risk_ids = register_df["RiskID"].tolist()
     else:
-        risk_seeds = [None] * len(register_df)
+        risk_ids = [f"Risk_{idx}" for idx in range(n_risks)]
 
-    # Simulate each risk
-    results = {}
-    portfolio_total = np.zeros(n_sims)
+    # Row 0 holds the portfolio total, row i + 1 risk i; filled in place
+    losses = np.zeros((n_risks + 1, n_sims), dtype=dtype)
 
-    for idx, (_, risk_row) in enumerate(register_df.iterrows()):
-        risk_id = risk_row.get("RiskID", f"Risk_{idx}")
+    def simulate_row(idx: int, params: tuple) -> None:
+        losses[idx + 1] = _simulate_risk(
+            *params, n_sims=n_sims, rng=np.random.default_rng(risk_seeds[idx])
+        )
 
-        # Simulate this risk
-        risk_losses = simulate_annual_loss(risk_row, n_sims=n_sims, seed=risk_seeds[idx])
+    # Simulate each risk; threads write disjoint rows of the shared buffer
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_workers = min(n_jobs, n_risks)
 
-        # Store individual risk results
-        results[f"by_risk:{risk_id}"] = risk_losses
+    if n_workers > 1:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(simulate_row, range(n_risks), zip(*param_columns)))
+    else:
+        for idx, params in enumerate(zip(*param_columns)):
+            simulate_row(idx, params)
+
+    # Add up the portfolio total in risk order, so it is the same for any n_jobs.
+    # Tiling over simulations keeps each slice of the total in cache across
+    # all risks instead of streaming the whole total from memory once per risk.
+    portfolio_total = losses[0] if dtype == np.float64 else np.zeros(n_sims)
+    for start in range(0, n_sims, _TOTAL_TILE):
+        tile = slice(start, start + _TOTAL_TILE)
+        total_tile = portfolio_total[tile]
+        for risk_losses in losses[1:, tile]:
+            total_tile += risk_losses
+    losses[0] = portfolio_total
+
+    # One column per RiskID; a repeated ID keeps its last risk's losses
+    # (every row still counts towards the total)
+    rows = {risk_id: idx + 1 for idx, risk_id in enumerate(risk_ids)}
+    if len(rows) < n_risks:
+        losses = losses[[0, *rows.values()]]
+
+    return list(rows), losses
+
+
+def _risk_seeds(n_risks: int, seed: Optional[int] = None) -> list[np.random.SeedSequence]:
+    """
+    Per-risk seed sequences spawned from a portfolio seed.
 
-        # Add to portfolio total
-        portfolio_total += risk_losses
+    SeedSequence.spawn gives statistically independent, collision-free
+    streams. Risk i always gets the same child for a given portfolio seed, so
+    a single risk can be re-simulated and reproduce its column of
+    simulate_portfolio.
 
-    # Create result DataFrame
-    result_df = pd.DataFrame(results)
-    result_df.insert(0, "portfolio_loss", portfolio_total)
+    Args:
+        n_risks: Number of risks in the register
+        seed: Portfolio random seed (None draws fresh OS entropy)
 
-    return result_df
+    Returns:
+        List of child SeedSequences, one per risk
+    """
+    return np.random.SeedSequence(seed).spawn(n_risks)
 
 
 def simulate_risk_batch(
@@ -160,14 +288,10 @@ def simulate_risk_batch(
     Returns:
         Dictionary mapping RiskID to loss array, plus 'portfolio' key for total
     """
-    result_df = simulate_portfolio(register_df, n_sims, seed)
-
-    # Extract arrays
-    output = {"portfolio": result_df["portfolio_loss"].values}
+    risk_ids, losses = _simulate_portfolio_array(register_df, n_sims, seed)
 
-    for col in result_df.columns:
-        if col.startswith("by_risk:"):
-            risk_id = col.replace("by_risk:", "")
-            output[risk_id] = result_df[col].values
+    # Row views into the simulated array, no DataFrame round-trip
+    output = {"portfolio": losses[0]}
+    output.update((str(risk_id), losses[idx + 1]) for idx, risk_id in enumerate(risk_ids))
 
     return output
@@ -4,16 +4,17 @@ Streamlit Dashboard for Enterprise Risk Quantification & Analytics Engine
 A comprehensive web interface for risk analysis using Monte Carlo simulation.
 """
 
-import io
 import sys
+import tempfile
+import uuid
 from datetime import datetime
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
+from plotly.colors import qualitative
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -24,7 +25,9 @@ from risk_mc import (
     quantify_register,
     simulate_annual_loss,
     simulate_portfolio,
+    summary,
 )
+from risk_mc.io import HAS_PYARROW
 from risk_mc.lec import plot_lec_plotly
 
 # Page configuration
@@ -73,6 +76,86 @@ if "quantified_df" not in st.session_state:
     st.session_state.quantified_df = None
 if "portfolio_df" not in st.session_state:
     st.session_state.portfolio_df = None
+    st.session_state.portfolio_key = None
+if "losses_dir" not in st.session_state:
+    # Per-session directory for simulated losses; removed with the session state
+    st.session_state.losses_dir = tempfile.TemporaryDirectory(prefix="risk_mc_")
+
+
+def _register_fingerprint(df: pd.DataFrame) -> tuple:
+    """Cheap cache key for a register: shape, columns and per-row content hashes"""
+    return df.shape, tuple(df.columns), pd.util.hash_pandas_object(df).to_numpy().tobytes()
+
+
+@st.cache_resource(
+    show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _register_fingerprint}
+)
+def _cached_portfolio(register_df: pd.DataFrame, n_sims: int, seed: int) -> pd.DataFrame:
+    """
+    Portfolio simulation, reused across reruns and tabs while the register is unchanged.
+
+    Held as a shared resource rather than pickled per read, so callers must
+    not modify the returned DataFrame.
+    """
+    return simulate_portfolio(register_df, n_sims=n_sims, seed=seed, n_jobs=-1)
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _register_fingerprint})
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """UTF-8 CSV export of a results table, serialised once per table"""
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def _format_columns(df: pd.DataFrame, formats: dict) -> pd.DataFrame:
+    """Copy of df with the given columns rendered as strings (cheaper than a Styler)"""
+    return df.assign(**{col: df[col].map(fmt.format) for col, fmt in formats.items()})
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _register_fingerprint})
+def _top_risks(quantified_df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Individual risks with the n largest SimMean, selected in O(N) with argpartition"""
+    individual = quantified_df[quantified_df["RiskID"] != "PORTFOLIO_TOTAL"]
+    vals = individual["SimMean"].to_numpy()
+    idx = np.argpartition(-vals, n - 1)[:n] if len(vals) > n else np.arange(len(vals))
+    idx = idx[np.argsort(-vals[idx], kind="stable")]
+    return individual.iloc[idx]
+
+
+@st.cache_data(show_spinner=False)
+def _risk_stats(losses: np.ndarray) -> dict:
+    """Summary statistics (quantiles, VaR, TVaR, ...) computed once per loss array"""
+    return summary(losses).to_dict()
+
+
+def _save_losses(key: str, losses: np.ndarray) -> None:
+    """Write simulated losses to the session's temp directory and keep only the path in state"""
+    previous = st.session_state.get(key)
+    if previous is not None:
+        try:
+            Path(previous).unlink(missing_ok=True)
+        except OSError:
+            pass  # still mapped elsewhere (Windows); left for the temp dir cleanup
+    path = Path(st.session_state.losses_dir.name) / f"{uuid.uuid4().hex}.npy"
+    np.save(path, losses)
+    st.session_state[key] = str(path)
+
+
+def _load_losses(key: str) -> np.ndarray:
+    """Memory-mapped view of losses saved by _save_losses (reductions stream from disk)"""
+    return np.asarray(np.load(st.session_state[key], mmap_mode="r"))
+
+
+def _render_metrics(specs: list) -> None:
+    """Render (label, value, help) metric specs side by side in one row of columns"""
+    for col, (label, value, help_text) in zip(st.columns(len(specs)), specs):
+        col.metric(label, value, help=help_text)
+
+
+def _categorise(df: pd.DataFrame) -> pd.DataFrame:
+    """Register with Category as a categorical, so grouping by it scans integer codes"""
+    if "Category" not in df.columns:
+        return df
+    return df.astype({"Category": "category"})
 
 
 def load_sample_data():
@@ -80,8 +163,7 @@ def load_sample_data():
     sample_path = Path(__file__).parent.parent / "data" / "sample_risk_register.csv"
     if sample_path.exists():
         try:
-            df = load_register(str(sample_path))
-            return df
+            return _categorise(load_register(str(sample_path)))
         except Exception as e:
             st.error(f"Error loading sample data: {str(e)}")
             return None
@@ -111,16 +193,16 @@ def risk_register_tab():
                 st.success(f"✅ Loaded {len(sample_df)} sample risks")
                 st.rerun()
 
-    # Load uploaded file
+    # Load uploaded file (parsed once; pandas' openpyxl reader is already read-only)
     if uploaded_file is not None:
         try:
             if uploaded_file.name.endswith(".csv"):
-                df = pd.read_csv(uploaded_file)
+                df = pd.read_csv(uploaded_file, engine="pyarrow" if HAS_PYARROW else "c")
             else:
                 df = pd.read_excel(uploaded_file)
 
             # Validate and load
-            st.session_state.register_df = load_register(io.BytesIO(uploaded_file.getvalue()))
+            st.session_state.register_df = _categorise(load_register(df))
             st.success(f"✅ Successfully loaded {len(df)} risks")
         except Exception as e:
             st.error(f"Error loading file: {str(e)}")
@@ -131,18 +213,15 @@ def risk_register_tab():
         st.subheader("Current Risk Register")
 
         # Summary metrics
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Total Risks", len(st.session_state.register_df))
-        with col2:
-            n_cats = st.session_state.register_df["Category"].nunique()
-            st.metric("Categories", n_cats)
-        with col3:
-            freq_models = st.session_state.register_df["FrequencyModel"].value_counts()
-            st.metric("Freq Models", f"{len(freq_models)} types")
-        with col4:
-            sev_models = st.session_state.register_df["SeverityModel"].value_counts()
-            st.metric("Sev Models", f"{len(sev_models)} types")
+        register = st.session_state.register_df
+        _render_metrics(
+            [
+                ("Total Risks", len(register), None),
+                ("Categories", register["Category"].nunique(), None),
+                ("Freq Models", f"{register['FrequencyModel'].nunique()} types", None),
+                ("Sev Models", f"{register['SeverityModel'].nunique()} types", None),
+            ]
+        )
 
         # Display dataframe
         display_cols = [
@@ -176,10 +255,18 @@ def risk_register_tab():
             if st.button("🎲 Run Quantification", type="primary", use_container_width=True):
                 with st.spinner(f"Running {n_sims:,} Monte Carlo simulations..."):
                     try:
-                        quantified = quantify_register(
+                        # Keep the samples so the LEC tab can reuse them
+                        portfolio_df = _cached_portfolio(
                             st.session_state.register_df, n_sims=n_sims, seed=42
                         )
+                        quantified = quantify_register(
+                            st.session_state.register_df, portfolio_df=portfolio_df
+                        )
                         st.session_state.quantified_df = quantified
+                        st.session_state.portfolio_df = portfolio_df
+                        st.session_state.portfolio_key = _register_fingerprint(
+                            st.session_state.register_df
+                        )
                         st.success("✅ Quantification complete!")
                         st.rerun()
                     except Exception as e:
@@ -202,23 +289,13 @@ def risk_register_tab():
             ]
 
             # Format numeric columns
-            display_df = st.session_state.quantified_df[result_cols].copy()
-
-            st.dataframe(
-                display_df.style.format(
-                    {
-                        "SimMean": "${:,.0f}",
-                        "SimP95": "${:,.0f}",
-                        "SimVaR95": "${:,.0f}",
-                        "SimVaR99": "${:,.0f}",
-                        "SimTVaR95": "${:,.0f}",
-                        "SimTVaR99": "${:,.0f}",
-                    }
-                ),
-                use_container_width=True,
-                height=400,
+            display_df = _format_columns(
+                st.session_state.quantified_df[result_cols],
+                dict.fromkeys(result_cols[2:], "${:,.0f}"),
             )
 
+            st.dataframe(display_df, use_container_width=True, height=400)
+
 
 def monte_carlo_tab():
     """Monte Carlo Simulation for Individual Risk"""
@@ -268,54 +345,54 @@ def monte_carlo_tab():
             with st.spinner("Running simulation..."):
                 try:
                     losses = simulate_annual_loss(risk_row, n_sims=n_sims, seed=42)
-                    st.session_state[f"sim_losses_{selected_risk_id}"] = losses
+                    _save_losses(f"sim_losses_{selected_risk_id}", losses)
                     st.success("✅ Simulation complete!")
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
 
     # Display results
     if f"sim_losses_{selected_risk_id}" in st.session_state:
-        losses = st.session_state[f"sim_losses_{selected_risk_id}"]
+        losses = _load_losses(f"sim_losses_{selected_risk_id}")
 
         st.markdown("---")
         st.subheader("Simulation Results")
 
         # Summary statistics
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Mean Loss", f"${np.mean(losses):,.0f}")
-        with col2:
-            st.metric("95% VaR", f"${np.percentile(losses, 95):,.0f}")
-        with col3:
-            st.metric("99% VaR", f"${np.percentile(losses, 99):,.0f}")
-        with col4:
-            var95 = np.percentile(losses, 95)
-            tail = losses[losses >= var95]
-            tvar95 = np.mean(tail) if len(tail) > 0 else var95
-            st.metric("95% TVaR", f"${tvar95:,.0f}")
-
-        # Histogram
+        stats = _risk_stats(losses)
+        _render_metrics(
+            [
+                ("Mean Loss", f"${stats['mean']:,.0f}", None),
+                ("95% VaR", f"${stats['var_95']:,.0f}", None),
+                ("99% VaR", f"${stats['var_99']:,.0f}", None),
+                ("95% TVaR", f"${stats['tvar_95']:,.0f}", None),
+            ]
+        )
+
+        # Histogram, binned here so only the 60 bar heights go to the browser
         st.subheader("Loss Distribution")
+        counts, edges = np.histogram(losses, bins=60)
         fig = go.Figure()
         fig.add_trace(
-            go.Histogram(
-                x=losses, nbinsx=60, name="Loss Distribution", marker_color="#2E86AB", opacity=0.75
+            go.Bar(
+                x=0.5 * (edges[:-1] + edges[1:]),
+                y=counts,
+                width=edges[1] - edges[0],
+                name="Loss Distribution",
+                marker_color="#2E86AB",
+                opacity=0.75,
             )
         )
 
         # Add VaR lines
-        var95 = np.percentile(losses, 95)
-        var99 = np.percentile(losses, 99)
-
         fig.add_vline(
-            x=var95,
+            x=stats["var_95"],
             line_dash="dash",
             line_color="red",
             annotation_text="95% VaR",
             annotation_position="top",
         )
         fig.add_vline(
-            x=var99,
+            x=stats["var_99"],
             line_dash="dash",
             line_color="darkred",
             annotation_text="99% VaR",
@@ -326,6 +403,7 @@ def monte_carlo_tab():
             title=f"Annual Loss Distribution - {selected_risk_id}",
             xaxis_title="Loss Amount ($)",
             yaxis_title="Frequency",
+            bargap=0,
             height=500,
             template="plotly_white",
         )
@@ -351,23 +429,26 @@ def monte_carlo_tab():
                         "TVaR99",
                     ],
                     "Value": [
-                        np.mean(losses),
-                        np.median(losses),
-                        np.std(losses),
-                        np.min(losses),
-                        np.max(losses),
-                        np.percentile(losses, 90),
-                        np.percentile(losses, 95),
-                        np.percentile(losses, 99),
-                        var95,
-                        var99,
-                        tvar95,
-                        np.mean(losses[losses >= var99]) if np.sum(losses >= var99) > 0 else var99,
+                        stats[key]
+                        for key in [
+                            "mean",
+                            "median",
+                            "std",
+                            "min",
+                            "max",
+                            "p90",
+                            "p95",
+                            "p99",
+                            "var_95",
+                            "var_99",
+                            "tvar_95",
+                            "tvar_99",
+                        ]
                     ],
                 }
             )
 
-            st.dataframe(stats_df.style.format({"Value": "${:,.2f}"}), use_container_width=True)
+            st.dataframe(_format_columns(stats_df, {"Value": "${:,.2f}"}), use_container_width=True)
 
 
 def lec_tab():
@@ -389,45 +470,38 @@ def lec_tab():
     if st.session_state.register_df is not None:
         with st.spinner("Generating Loss Exceedance Curve..."):
             try:
-                # Run portfolio simulation for LEC
-                portfolio_df = simulate_portfolio(
-                    st.session_state.register_df, n_sims=50000, seed=42
-                )
+                # Reuse the quantification samples while the register is unchanged,
+                # else simulate (cached across reruns)
+                portfolio_df = st.session_state.portfolio_df
+                register_key = _register_fingerprint(st.session_state.register_df)
+                if portfolio_df is None or st.session_state.portfolio_key != register_key:
+                    portfolio_df = _cached_portfolio(
+                        st.session_state.register_df, n_sims=50000, seed=42
+                    )
                 portfolio_losses = portfolio_df["portfolio_loss"].values
 
-                # Calculate LEC points
-                lec_points(portfolio_losses, n_points=100)
-
                 # Plot interactive LEC
                 st.subheader("Interactive Loss Exceedance Curve")
                 fig = plot_lec_plotly(portfolio_losses, mark_percentiles=[0.95, 0.99])
                 st.plotly_chart(fig, use_container_width=True)
 
                 # Key metrics
+                stats = _risk_stats(portfolio_losses)
                 st.markdown("---")
                 st.subheader("Key Risk Metrics")
 
-                col1, col2, col3, col4 = st.columns(4)
-
-                with col1:
-                    st.metric(
-                        "Expected Loss",
-                        f"${np.mean(portfolio_losses):,.0f}",
-                        help="Mean annual portfolio loss",
-                    )
-
-                with col2:
-                    p95 = np.percentile(portfolio_losses, 95)
-                    st.metric("95% VaR", f"${p95:,.0f}", help="1-in-20 year loss")
-
-                with col3:
-                    p99 = np.percentile(portfolio_losses, 99)
-                    st.metric("99% VaR", f"${p99:,.0f}", help="1-in-100 year loss")
-
-                with col4:
-                    tail95 = portfolio_losses[portfolio_losses >= p95]
-                    tvar95 = np.mean(tail95) if len(tail95) > 0 else p95
-                    st.metric("95% TVaR", f"${tvar95:,.0f}", help="Expected loss in tail scenarios")
+                _render_metrics(
+                    [
+                        ("Expected Loss", f"${stats['mean']:,.0f}", "Mean annual portfolio loss"),
+                        ("95% VaR", f"${stats['var_95']:,.0f}", "1-in-20 year loss"),
+                        ("99% VaR", f"${stats['var_99']:,.0f}", "1-in-100 year loss"),
+                        (
+                            "95% TVaR",
+                            f"${stats['tvar_95']:,.0f}",
+                            "Expected loss in tail scenarios",
+                        ),
+                    ]
+                )
 
                 # Exceedance probabilities table
                 st.markdown("---")
@@ -447,12 +521,13 @@ def lec_tab():
                 ]
 
                 st.dataframe(
-                    display_df.style.format(
+                    _format_columns(
+                        display_df,
                         {
                             "Probability (%)": "{:.1f}%",
                             "Loss Threshold ($)": "${:,.0f}",
                             "Return Period (years)": "{:.1f}",
-                        }
+                        },
                     ),
                     use_container_width=True,
                 )
@@ -477,15 +552,14 @@ def kpi_dashboard_tab():
 
     portfolio_row = quantified[quantified["RiskID"] == "PORTFOLIO_TOTAL"].iloc[0]
 
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Total Risks", len(register))
-    with col2:
-        st.metric("Expected Annual Loss", f"${portfolio_row['SimMean']:,.0f}")
-    with col3:
-        st.metric("95% VaR", f"${portfolio_row['SimVaR95']:,.0f}")
-    with col4:
-        st.metric("99% TVaR", f"${portfolio_row['SimTVaR99']:,.0f}")
+    _render_metrics(
+        [
+            ("Total Risks", len(register), None),
+            ("Expected Annual Loss", f"${portfolio_row['SimMean']:,.0f}", None),
+            ("95% VaR", f"${portfolio_row['SimVaR95']:,.0f}", None),
+            ("99% TVaR", f"${portfolio_row['SimTVaR99']:,.0f}", None),
+        ]
+    )
 
     st.markdown("---")
 
@@ -496,7 +570,7 @@ def kpi_dashboard_tab():
         st.subheader("Top 5 Risk Exposures")
 
         individual_risks = quantified[quantified["RiskID"] != "PORTFOLIO_TOTAL"].copy()
-        top5 = individual_risks.nlargest(5, "SimMean")
+        top5 = _top_risks(quantified)
 
         fig = go.Figure(
             go.Bar(
@@ -528,7 +602,9 @@ def kpi_dashboard_tab():
         st.subheader("Risk Distribution by Category")
 
         cat_summary = (
-            individual_risks.groupby("Category")["SimMean"].sum().sort_values(ascending=False)
+            individual_risks.groupby("Category", observed=True)["SimMean"]
+            .sum()
+            .sort_values(ascending=False)
         )
 
         fig = go.Figure(
@@ -537,7 +613,7 @@ def kpi_dashboard_tab():
                 values=cat_summary.values,
                 hole=0.4,
                 textinfo="label+percent",
-                marker={"colors": px.colors.qualitative.Set3},
+                marker={"colors": qualitative.Set3},
             )
         )
 
@@ -553,16 +629,15 @@ def kpi_dashboard_tab():
     col1, col2 = st.columns(2)
 
     with col1:
-        # Inherent vs Residual comparison
-        comparison_data = []
-        for _, row in register.iterrows():
-            inherent = 1.0 / (1 - row["ControlEffectiveness"])  # Reverse engineer
-            residual = row["ResidualFactor"]
-            comparison_data.append(
-                {"RiskID": row["RiskID"], "Inherent": inherent, "Residual": residual}
-            )
-
-        comp_df = pd.DataFrame(comparison_data).head(10)
+        # Inherent vs Residual comparison (first 10 risks)
+        shown = register.head(10)
+        comp_df = pd.DataFrame(
+            {
+                "RiskID": shown["RiskID"],
+                "Inherent": 1.0 / (1 - shown["ControlEffectiveness"]),  # Reverse engineer
+                "Residual": shown["ResidualFactor"],
+            }
+        )
 
         fig = go.Figure()
         fig.add_trace(
@@ -630,9 +705,7 @@ def export_tab():
     st.subheader("📊 Export Quantified Register (CSV)")
     st.markdown("Download the complete risk register with all quantified metrics.")
 
-    csv_buffer = io.StringIO()
-    st.session_state.quantified_df.to_csv(csv_buffer, index=False)
-    csv_data = csv_buffer.getvalue()
+    csv_data = _csv_bytes(st.session_state.quantified_df)
 
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -704,8 +777,11 @@ def export_tab():
 def generate_executive_summary(quantified_df, register_df):
     """Generate executive summary text"""
     portfolio = quantified_df[quantified_df["RiskID"] == "PORTFOLIO_TOTAL"].iloc[0]
-    individual = quantified_df[quantified_df["RiskID"] != "PORTFOLIO_TOTAL"].copy()
-    top_risk = individual.nlargest(1, "SimMean").iloc[0]
+    top5 = _top_risks(quantified_df)
+    top_risk = top5.iloc[0]
+    # Share of portfolio expected loss for each of the top 5, in one division
+    pcts = top5["SimMean"].to_numpy() / float(portfolio["SimMean"]) * 100
+    top_pct = pcts[0]
 
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -744,15 +820,16 @@ TOP RISK CONTRIBUTORS
 Top Risk: {top_risk['RiskID']} - {top_risk['Category']}
   Expected Loss:                     ${top_risk['SimMean']:>15,.0f}
   95% VaR:                           ${top_risk['SimVaR95']:>15,.0f}
-  Contribution to Portfolio:         {(top_risk['SimMean']/portfolio['SimMean']*100):>15.1f}%
+  Contribution to Portfolio:         {top_pct:>15.1f}%
 
 Top 5 Risks by Expected Loss:
 """
 
-    top5 = individual.nlargest(5, "SimMean")
-    for idx, (_, row) in enumerate(top5.iterrows(), 1):
-        pct = (row["SimMean"] / portfolio["SimMean"]) * 100
-        summary += f"\n{idx}. {row['RiskID']:<10} ${row['SimMean']:>12,.0f}  ({pct:>5.1f}%)"
+    lines = [
+        f"{idx}. {row.RiskID:<10} ${row.SimMean:>12,.0f}  ({pct:>5.1f}%)"
+        for idx, (row, pct) in enumerate(zip(top5.itertuples(index=False), pcts), 1)
+    ]
+    summary += "\n" + "\n".join(lines)
 
     summary += f"""
 
@@ -765,7 +842,7 @@ RECOMMENDATIONS
    - Consider ${portfolio['SimTVaR95']:,.0f} for tail risk capital
 
 2. Risk Mitigation Priority
-   - Focus on {top_risk['RiskID']} ({pct:.1f}% of expected loss)
+   - Focus on {top_risk['RiskID']} ({top_pct:.1f}% of expected loss)
    - Review control effectiveness for top 5 contributors
 
 3. Monitoring
@@ -2,10 +2,30 @@
 Risk Register Management - Load and manage risk data from CSV/XLS
 """
 
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Text columns stored as categoricals, with the default used when one is absent
+_CATEGORICAL_DEFAULTS = {"category": "General", "owner": "Unassigned", "status": "Active"}
+
+
+@lru_cache(maxsize=16)
+def _read_excel_cached(path: str, mtime_ns: int, sheet_name: Union[str, int]) -> pd.DataFrame:
+    """Parsed Excel sheet, reused while the file is unmodified (mtime_ns is only a cache key)"""
+    return pd.read_excel(path, sheet_name=sheet_name)
+
 
 class RiskRegister:
     """Risk register management and data loading"""
@@ -13,6 +33,10 @@ class RiskRegister:
     def __init__(self):
         self.risks_df: Optional[pd.DataFrame] = None
         self.original_df: Optional[pd.DataFrame] = None
+        # Risks from add_risk not yet appended to risks_df (see _flush), and
+        # the columns they bring
+        self._pending: list[dict] = []
+        self._pending_columns: set = set()
 
     def load_from_csv(self, filepath: str) -> pd.DataFrame:
         """
@@ -24,9 +48,11 @@ class RiskRegister:
         Returns:
             DataFrame with risk data
         """
+        self._clear_pending()
         try:
-            self.risks_df = pd.read_csv(filepath)
-            self.original_df = self.risks_df.copy()
+            # pyarrow's multithreaded parser when available
+            self.risks_df = pd.read_csv(filepath, engine="pyarrow" if HAS_PYARROW else "c")
+            self.original_df = self.risks_df
             self._validate_and_clean()
             return self.risks_df
         except Exception as e:
@@ -43,9 +69,19 @@ class RiskRegister:
         Returns:
             DataFrame with risk data
         """
+        self._clear_pending()
         try:
-            self.risks_df = pd.read_excel(filepath, sheet_name=sheet_name)
-            self.original_df = self.risks_df.copy()
+            if isinstance(filepath, (str, Path)):
+                # Repeat loads of an unchanged workbook skip the openpyxl parse;
+                # copy so the cached frame is never handed out as original_df
+                path = Path(filepath).resolve()
+                self.risks_df = _read_excel_cached(
+                    str(path), path.stat().st_mtime_ns, sheet_name
+                ).copy()
+            else:
+                # Uploaded file objects have no path to key the cache on
+                self.risks_df = pd.read_excel(filepath, sheet_name=sheet_name)
+            self.original_df = self.risks_df
             self._validate_and_clean()
             return self.risks_df
         except Exception as e:
@@ -61,8 +97,10 @@ class RiskRegister:
         Returns:
             Cleaned DataFrame
         """
-        self.risks_df = df.copy()
+        self._clear_pending()
+        # One copy, so later edits to the caller's frame do not reach the snapshot
         self.original_df = df.copy()
+        self.risks_df = self.original_df
         self._validate_and_clean()
         return self.risks_df
 
@@ -71,16 +109,23 @@ class RiskRegister:
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
 
-        # Ensure required columns exist
-        required_cols = ["risk_id", "risk_name", "likelihood", "impact"]
-        missing_cols = [col for col in required_cols if col not in self.risks_df.columns]
+        self.risks_df = self._clean(self.risks_df)
+
+    @staticmethod
+    def _clean(df: pd.DataFrame) -> pd.DataFrame:
+        """Cleaned frame for _validate_and_clean, leaving df untouched"""
+        n = len(df)
 
-        if missing_cols:
-            # Try to create missing columns with defaults
-            if "risk_id" not in self.risks_df.columns:
-                self.risks_df["risk_id"] = [f"R{i:03d}" for i in range(1, len(self.risks_df) + 1)]
-            if "risk_name" not in self.risks_df.columns:
-                self.risks_df["risk_name"] = [f"Risk {i}" for i in range(1, len(self.risks_df) + 1)]
+        # Missing columns are gathered here and added in one assign at the end,
+        # rather than inserting (and consolidating) one column at a time
+        defaults = {}
+
+        # Ensure required columns exist
+        if "risk_id" not in df.columns:
+            ids = np.arange(1, n + 1).astype(str)
+            defaults["risk_id"] = np.char.add("R", np.char.zfill(ids, 3))
+        if "risk_name" not in df.columns:
+            defaults["risk_name"] = np.char.add("Risk ", np.arange(1, n + 1).astype(str))
 
         # Ensure numeric columns
         numeric_cols = [
@@ -94,59 +139,64 @@ class RiskRegister:
             "residual_risk_score",
         ]
 
-        for col in numeric_cols:
-            if col in self.risks_df.columns:
-                self.risks_df[col] = pd.to_numeric(self.risks_df[col], errors="coerce")
+        coerced = {
+            col: pd.to_numeric(df[col], errors="coerce")
+            for col in numeric_cols
+            if col in df.columns
+        }
 
         # Fill missing values with defaults
-        if "likelihood_std" not in self.risks_df.columns:
-            self.risks_df["likelihood_std"] = 0.1
+        if "likelihood_std" not in df.columns:
+            defaults["likelihood_std"] = np.full(n, 0.1)
 
-        if "impact_min" not in self.risks_df.columns:
-            self.risks_df["impact_min"] = self.risks_df["impact"] * 0.5
+        if "impact_min" not in df.columns:
+            defaults["impact_min"] = coerced["impact"] * 0.5
 
-        if "impact_most_likely" not in self.risks_df.columns:
-            self.risks_df["impact_most_likely"] = self.risks_df["impact"]
+        if "impact_most_likely" not in df.columns:
+            defaults["impact_most_likely"] = coerced["impact"]
 
-        if "impact_max" not in self.risks_df.columns:
-            self.risks_df["impact_max"] = self.risks_df["impact"] * 1.5
+        if "impact_max" not in df.columns:
+            defaults["impact_max"] = coerced["impact"] * 1.5
 
         # Calculate risk scores if not present
-        if "inherent_risk_score" not in self.risks_df.columns:
-            self.risks_df["inherent_risk_score"] = (
-                self.risks_df["likelihood"] * self.risks_df["impact"]
-            )
+        if "inherent_risk_score" in coerced:
+            inherent = coerced["inherent_risk_score"]
+        else:
+            inherent = defaults["inherent_risk_score"] = coerced["likelihood"] * coerced["impact"]
 
-        if "residual_risk_score" not in self.risks_df.columns:
+        if "residual_risk_score" not in df.columns:
             # Assume 30% risk reduction after controls
-            self.risks_df["residual_risk_score"] = self.risks_df["inherent_risk_score"] * 0.7
-
-        # Add default category if missing
-        if "category" not in self.risks_df.columns:
-            self.risks_df["category"] = "General"
+            defaults["residual_risk_score"] = inherent * 0.7
 
-        # Add default owner if missing
-        if "owner" not in self.risks_df.columns:
-            self.risks_df["owner"] = "Unassigned"
+        # Category, owner and status are categoricals, so filters and counts
+        # compare integer codes; missing columns get their default
+        for col, value in _CATEGORICAL_DEFAULTS.items():
+            if col in df.columns:
+                defaults[col] = df[col].astype("category")
+            else:
+                defaults[col] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [value])
 
-        # Add status if missing
-        if "status" not in self.risks_df.columns:
-            self.risks_df["status"] = "Active"
+        # assign returns a new frame, so the loaders' original_df snapshot (the
+        # frame as read) needs no copy of its own
+        return df.assign(**coerced, **defaults)
 
     def get_risks(self) -> pd.DataFrame:
         """Get current risk register"""
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
         return self.risks_df
 
     def filter_by_category(self, category: str) -> pd.DataFrame:
         """Filter risks by category"""
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
         return self.risks_df[self.risks_df["category"] == category]
 
     def filter_by_status(self, status: str) -> pd.DataFrame:
         """Filter risks by status"""
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
         return self.risks_df[self.risks_df["status"] == status]
@@ -161,27 +211,64 @@ class RiskRegister:
         Returns:
             DataFrame with high priority risks
         """
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
 
-        threshold_value = self.risks_df["residual_risk_score"].quantile(threshold)
-        return self.risks_df[self.risks_df["residual_risk_score"] >= threshold_value]
+        # np.partition wraps negative positions, so check the range Series.quantile did
+        if not 0 <= threshold <= 1:
+            raise ValueError(f"threshold must be in [0, 1], got {threshold}")
+
+        # Same linearly interpolated quantile as Series.quantile, but found with
+        # an O(n) partition around the two neighbouring order statistics
+        scores = self.risks_df["residual_risk_score"].to_numpy(dtype=float)
+        valid = scores[~np.isnan(scores)]
+        if len(valid) == 0:
+            return self.risks_df.iloc[:0]
+
+        position = threshold * (len(valid) - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, len(valid) - 1)
+        partitioned = np.partition(valid, [lower, upper])
+        threshold_value = partitioned[lower] + (partitioned[upper] - partitioned[lower]) * (
+            position - lower
+        )
+
+        return self.risks_df[scores >= threshold_value]
 
     def get_summary_statistics(self) -> dict:
         """Get summary statistics for risk register"""
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
 
+        df = self.risks_df
+
+        # Score column means in one reduction; the impact total is summed on its
+        # own so an integer impact column keeps an integer total
+        means = df[["likelihood", "impact", "inherent_risk_score", "residual_risk_score"]].mean()
+
+        # Category counts from the integer codes. Counting in order of first
+        # appearance before the sort breaks ties the way value_counts does for
+        # text; a categorical's value_counts would break them by category order
+        codes = df["category"].cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        seen = pd.unique(codes)
+        category_counts = pd.Series(
+            np.bincount(codes)[seen],
+            index=df["category"].cat.categories[seen],
+        ).sort_values(ascending=False)
+
         stats = {
-            "total_risks": len(self.risks_df),
-            "active_risks": len(self.risks_df[self.risks_df["status"] == "Active"]),
-            "avg_likelihood": self.risks_df["likelihood"].mean(),
-            "avg_impact": self.risks_df["impact"].mean(),
-            "avg_inherent_score": self.risks_df["inherent_risk_score"].mean(),
-            "avg_residual_score": self.risks_df["residual_risk_score"].mean(),
-            "total_potential_impact": self.risks_df["impact"].sum(),
-            "categories": self.risks_df["category"].nunique(),
-            "category_breakdown": self.risks_df["category"].value_counts().to_dict(),
+            "total_risks": len(df),
+            "active_risks": int((df["status"] == "Active").sum()),
+            "avg_likelihood": means["likelihood"],
+            "avg_impact": means["impact"],
+            "avg_inherent_score": means["inherent_risk_score"],
+            "avg_residual_score": means["residual_risk_score"],
+            "total_potential_impact": df["impact"].sum(),
+            "categories": len(category_counts),
+            "category_breakdown": category_counts.to_dict(),
         }
 
         return stats
@@ -195,22 +282,37 @@ class RiskRegister:
         """
         Export risk register to CSV
 
+        Written by pyarrow when it is installed, which quotes string fields and
+        drops the ".0" from whole floats (50 rather than 50.0); the file reads
+        back to the same values as the pandas output.
+
         Args:
             filepath: Output file path
             include_quantified: Whether to include quantified results
             quantified_df: DataFrame with quantified results
         """
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
 
         if include_quantified and quantified_df is not None:
-            # Merge original risk data with quantified results
-            export_df = self.risks_df.merge(
-                quantified_df, on="risk_id", how="left", suffixes=("", "_quantified")
+            # Join quantified results on their risk_id index, so only the
+            # quantified side is hashed (a left join, as merge was)
+            export_df = self.risks_df.join(
+                quantified_df.set_index("risk_id"), on="risk_id", rsuffix="_quantified"
             )
         else:
             export_df = self.risks_df
 
+        # pyarrow's C++ CSV writer when available; pandas for anything it cannot
+        # convert or write (e.g. mixed-type object columns)
+        if HAS_PYARROW:
+            try:
+                pa_csv.write_csv(pa.Table.from_pandas(export_df, preserve_index=False), filepath)
+                return
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                pass
+
         export_df.to_csv(filepath, index=False)
 
     def get_risk_matrix_data(self) -> pd.DataFrame:
@@ -220,10 +322,14 @@ class RiskRegister:
         Returns:
             DataFrame with likelihood and impact for plotting
         """
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
 
-        matrix_data = self.risks_df[
+        # Column selection already copies the data; the shallow copy only drops
+        # pandas' link to risks_df, so callers can add columns without a
+        # SettingWithCopyWarning, as they could with the old deep copy
+        return self.risks_df[
             [
                 "risk_id",
                 "risk_name",
@@ -233,32 +339,70 @@ class RiskRegister:
                 "inherent_risk_score",
                 "residual_risk_score",
             ]
-        ].copy()
-
-        return matrix_data
+        ].copy(deep=False)
 
     def add_risk(self, risk_data: dict):
-        """Add a new risk to the register"""
+        """Add a new risk to the register (appended and cleaned on the next access)"""
+        # Check the risk now rather than on the next read: cleaning an empty frame
+        # with the register's columns plus this risk's raises the same error for
+        # a missing column (e.g. no impact to score from) as appending it would
+        columns = self._pending_columns.union(risk_data)
+        if self.risks_df is not None:
+            columns.update(self.risks_df.columns)
+        self._clean(pd.DataFrame(columns=list(columns)))
+
+        self._pending.append(risk_data)
+        self._pending_columns = columns
+
+    def _clear_pending(self):
+        """Drop risks queued by add_risk"""
+        self._pending = []
+        self._pending_columns = set()
+
+    def _flush(self):
+        """Append risks queued by add_risk with a single concat and clean once"""
+        if not self._pending:
+            return
+
+        new_risks = pd.DataFrame(self._pending)
+        self._clear_pending()
         if self.risks_df is None:
-            self.risks_df = pd.DataFrame()
-
-        new_risk = pd.DataFrame([risk_data])
-        self.risks_df = pd.concat([self.risks_df, new_risk], ignore_index=True)
+            self.risks_df = new_risks
+        else:
+            self.risks_df = pd.concat([self.risks_df, new_risks], ignore_index=True)
         self._validate_and_clean()
 
     def update_risk(self, risk_id: str, updates: dict):
         """Update an existing risk"""
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
 
         mask = self.risks_df["risk_id"] == risk_id
         for key, value in updates.items():
             if key in self.risks_df.columns:
+                column = self.risks_df[key]
+                if not isinstance(column.dtype, pd.CategoricalDtype):
+                    self.risks_df.loc[mask, key] = value
+                    continue
+
+                if pd.notna(value) and value not in column.cat.categories:
+                    self.risks_df[key] = column.cat.add_categories([value])
                 self.risks_df.loc[mask, key] = value
+                # Drop a category the update left without risks, as delete_risk does
+                self.risks_df[key] = self.risks_df[key].cat.remove_unused_categories()
 
     def delete_risk(self, risk_id: str):
         """Delete a risk from the register"""
+        self._flush()
         if self.risks_df is None:
             raise ValueError("No risk data loaded")
 
-        self.risks_df = self.risks_df[self.risks_df["risk_id"] != risk_id]
+        kept = self.risks_df[self.risks_df["risk_id"] != risk_id]
+        # Drop categories left without risks so counts and charts do not list them
+        self.risks_df = kept.assign(
+            **{
+                col: kept[col].cat.remove_unused_categories()
+                for col in kept.select_dtypes("category").columns
+            }
+        )
@@ -4,9 +4,11 @@ Smoke tests for Streamlit dashboard
 Tests basic functionality without running the full Streamlit server.
 """
 
+import io
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -60,6 +62,8 @@ class TestDashboardFunctions:
         assert "R1" in summary or "R2" in summary
         assert "$" in summary
         assert "VaR" in summary
+        assert "1. R2" in summary and "2. R1" in summary
+        assert "Focus on R2 (66.7% of expected loss)" in summary
 
     def test_load_sample_data(self):
         """Test loading sample data"""
@@ -71,6 +75,83 @@ class TestDashboardFunctions:
             assert len(df) > 0
             assert "RiskID" in df.columns
 
+    def test_cached_portfolio(self):
+        """Test that the cached simulation matches a direct run and tracks register edits"""
+        from risk_mc import simulate_portfolio
+
+        register_df = pd.DataFrame(
+            {"RiskID": ["R1", "R2"], "FreqParam1": [1.0, 2.0], "SevParam1": [10.0, 11.0]}
+        )
+
+        result = dashboard._cached_portfolio(register_df, n_sims=500, seed=42)
+        pd.testing.assert_frame_equal(result, simulate_portfolio(register_df, n_sims=500, seed=42))
+
+        edited = register_df.assign(FreqParam1=[1.0, 0.0])
+        assert dashboard._register_fingerprint(edited) != dashboard._register_fingerprint(
+            register_df
+        )
+        assert (dashboard._cached_portfolio(edited, n_sims=500, seed=42)["by_risk:R2"] == 0).all()
+
+    def test_risk_stats(self):
+        """Test that cached loss statistics match the direct computations"""
+        losses = np.random.default_rng(0).lognormal(10, 1, 5000)
+        stats = dashboard._risk_stats(losses)
+
+        assert stats["var_95"] == np.percentile(losses, 95)
+        assert stats["var_99"] == np.percentile(losses, 99)
+        assert stats["tvar_95"] == pytest.approx(losses[losses >= stats["var_95"]].mean())
+        assert stats["mean"] == pytest.approx(losses.mean())
+
+    def test_csv_bytes(self):
+        """Test that the cached CSV export round-trips the table"""
+        df = pd.DataFrame({"RiskID": ["R1", "R2"], "SimMean": [1.5, 2.0]})
+
+        data = dashboard._csv_bytes(df)
+
+        assert isinstance(data, bytes)
+        pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(data)), df)
+
+    def test_format_columns(self):
+        """Test that only the listed columns are rendered as strings"""
+        df = pd.DataFrame({"RiskID": ["R1"], "Loss Threshold ($)": [1234567.8]})
+
+        result = dashboard._format_columns(df, {"Loss Threshold ($)": "${:,.0f}"})
+
+        assert result["Loss Threshold ($)"].tolist() == ["$1,234,568"]
+        assert df["Loss Threshold ($)"].iloc[0] == 1234567.8
+
+    def test_top_risks(self):
+        """Test that top-N selection matches nlargest and skips the portfolio row"""
+        quantified_df = pd.DataFrame(
+            {
+                "RiskID": [f"R{i}" for i in range(8)] + ["PORTFOLIO_TOTAL"],
+                "SimMean": [5.0, 1.0, 7.0, 3.0, 8.0, 2.0, 6.0, 4.0, 36.0],
+            }
+        )
+
+        top5 = dashboard._top_risks(quantified_df)
+        expected = quantified_df.iloc[:-1].nlargest(5, "SimMean")
+
+        pd.testing.assert_frame_equal(top5, expected)
+        assert len(dashboard._top_risks(quantified_df.iloc[[0, 1, 8]])) == 2
+
+    def test_saved_losses_round_trip(self):
+        """Test that losses kept on disk load back unchanged and replace the previous file"""
+        losses = np.random.default_rng(0).lognormal(10, 1, 1000)
+
+        dashboard._save_losses("sim_losses_test", losses)
+        first_path = Path(dashboard.st.session_state["sim_losses_test"])
+        dashboard._save_losses("sim_losses_test", losses * 2)
+
+        np.testing.assert_array_equal(dashboard._load_losses("sim_losses_test"), losses * 2)
+        assert not first_path.exists()
+
+        # Files live in the session's directory, which is deleted with it
+        session_dir = Path(dashboard.st.session_state.losses_dir.name)
+        assert list(session_dir.iterdir()) == [Path(dashboard.st.session_state["sim_losses_test"])]
+        dashboard.st.session_state.losses_dir.cleanup()
+        assert not session_dir.exists()
+
 
 class TestDashboardImport:
     """Test that dashboard can be imported"""
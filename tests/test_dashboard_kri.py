@@ -6,6 +6,7 @@ import sys
 from pathlib import Path
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -13,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from risk_mc.dashboard_kri import (
     calculate_kpi_kri_summary,
+    enrich_register,
     generate_trend_data,
     plot_top_exposures,
     plot_trend_chart,
@@ -42,6 +44,41 @@ def sample_quantified_df():
     )
 
 
+class TestEnrichRegister:
+    """Test derived inherent/residual columns."""
+
+    def test_adds_derived_columns(self, sample_quantified_df):
+        """Test that all derived columns are added without mutating the input."""
+        enriched = enrich_register(sample_quantified_df)
+
+        for col in [
+            "InherentLoss",
+            "ResidualLoss",
+            "Mitigation",
+            "pct_of_total_mean",
+            "pct_of_total_var95",
+        ]:
+            assert col in enriched.columns
+        assert "InherentLoss" not in sample_quantified_df.columns
+
+    def test_portfolio_inherent_is_sum_of_risks(self, sample_quantified_df):
+        """Test that portfolio inherent loss aggregates individual risks."""
+        enriched = enrich_register(sample_quantified_df)
+        is_total = enriched["RiskID"] == "PORTFOLIO_TOTAL"
+
+        assert enriched.loc[is_total, "InherentLoss"].iloc[0] == pytest.approx(
+            enriched.loc[~is_total, "InherentLoss"].sum()
+        )
+        assert enriched.loc[is_total, "pct_of_total_mean"].iloc[0] == pytest.approx(100.0)
+
+    def test_summary_accepts_enriched_register(self, sample_quantified_df):
+        """Test that KPI summary gives the same result for enriched input."""
+        raw = calculate_kpi_kri_summary(sample_quantified_df)
+        enriched = calculate_kpi_kri_summary(enrich_register(sample_quantified_df))
+
+        assert raw["total_inherent_loss"] == pytest.approx(enriched["total_inherent_loss"])
+
+
 class TestResidualInherentHeatmap:
     """Test residual vs inherent heatmap functionality."""
 
@@ -145,6 +182,16 @@ class TestTrendData:
         trend2 = generate_trend_data(sample_quantified_df, n_periods=4)
         pd.testing.assert_frame_equal(trend1, trend2)
 
+    def test_leaves_global_random_state(self, sample_quantified_df):
+        """Test that the internal seed does not reseed NumPy's global random state."""
+        np.random.seed(0)
+        expected = np.random.random()
+        np.random.seed(0)
+
+        generate_trend_data(sample_quantified_df, n_periods=4)
+
+        assert np.random.random() == expected
+
     def test_concentration_bounded(self, sample_quantified_df):
         """Test that concentration stays within 0-100%."""
         trend_df = generate_trend_data(sample_quantified_df, n_periods=10)
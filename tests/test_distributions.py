@@ -18,6 +18,7 @@ from risk_mc.distributions import (
     sample_severity_lognormal,
     sample_severity_normal,
     sample_severity_pert,
+    sample_severity_pert_batch,
 )
 
 
@@ -127,6 +128,13 @@ class TestLognormalDistribution:
         with pytest.raises(ValueError, match="sigma must be > 0"):
             sample_severity_lognormal(10.0, -0.5, 100)
 
+    def test_lognormal_matches_generator_stream(self):
+        """Test that samples match rng.lognormal from the same seed."""
+        samples = sample_severity_lognormal(10.0, 1.5, 5000, np.random.default_rng(3))
+        expected = np.random.default_rng(3).lognormal(10.0, 1.5, size=5000)
+
+        np.testing.assert_allclose(samples, expected, rtol=1e-14)
+
 
 class TestNormalDistribution:
     """Tests for Normal severity distribution."""
@@ -150,6 +158,13 @@ class TestNormalDistribution:
 
         assert len(samples) == 0
 
+    def test_normal_matches_generator_stream(self):
+        """Test that samples match clipped rng.normal from the same seed."""
+        samples = sample_severity_normal(50000, 100000, 5000, np.random.default_rng(3))
+        expected = np.random.default_rng(3).normal(50000, 100000, size=5000)
+
+        np.testing.assert_array_equal(samples, np.maximum(expected, 0))
+
 
 class TestPERTDistribution:
     """Tests for PERT severity distribution."""
@@ -199,6 +214,50 @@ class TestPERTDistribution:
 
         assert len(samples) == 0
 
+    def test_pert_batch_values_in_per_event_range(self):
+        """Test that batched PERT respects each event's own [min, max]."""
+        rng = np.random.default_rng(42)
+        min_vals = np.repeat([50000.0, 1000.0], 2000)
+        modes = np.repeat([100000.0, 2000.0], 2000)
+        max_vals = np.repeat([300000.0, 9000.0], 2000)
+
+        samples = sample_severity_pert_batch(min_vals, modes, max_vals, rng)
+
+        assert samples.shape == (4000,)
+        assert np.all(samples >= min_vals)
+        assert np.all(samples <= max_vals)
+
+    def test_pert_batch_invalid_order_reports_indices(self):
+        """Test that invalid triples are reported by index."""
+        with pytest.raises(ValueError, match=r"indices \[1\]"):
+            sample_severity_pert_batch([0.0, 100.0], [50.0, 50.0], [100.0, 200.0])
+
+    def test_pert_batch_symmetric_triple(self):
+        """Test batched PERT when mode is the midpoint (mode == PERT mean)."""
+        rng = np.random.default_rng(42)
+        samples = sample_severity_pert_batch(np.zeros(20000), np.full(20000, 5.0), 10.0, rng)
+
+        assert not np.isnan(samples).any()
+        assert np.all((samples >= 0) & (samples <= 10))
+        assert np.mean(samples) == pytest.approx(5.0, rel=0.02)
+
+    def test_pert_batch_mode_at_endpoint(self):
+        """Test batched PERT with mode at min and at max."""
+        rng = np.random.default_rng(42)
+        at_min = sample_severity_pert_batch(np.zeros(20000), 0.0, 60.0, rng)
+        at_max = sample_severity_pert_batch(np.zeros(20000), 60.0, 60.0, rng)
+
+        assert not np.isnan(at_min).any() and not np.isnan(at_max).any()
+        # PERT mean is (min + 4 * mode + max) / 6
+        assert np.mean(at_min) == pytest.approx(10.0, rel=0.03)
+        assert np.mean(at_max) == pytest.approx(50.0, rel=0.03)
+
+    def test_pert_batch_degenerate_case(self):
+        """Test batched PERT when min=mode=max."""
+        samples = sample_severity_pert_batch([5.0, 5.0], [5.0, 5.0], [5.0, 5.0])
+
+        assert np.all(samples == 5.0)
+
 
 class TestDistributionMonotonicity:
     """Tests for statistical monotonicity properties."""
@@ -11,6 +11,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from risk_mc import io as risk_io
 from risk_mc.io import load_register, save_quantified_register, validate_register_format
 
 
@@ -59,6 +60,77 @@ R1,Poisson,1.0"""
         with pytest.raises(ValueError, match="Missing required columns"):
             load_register(str(csv_path))
 
+    def test_load_parquet(self, tmp_path):
+        """Test loading a Parquet register."""
+        pytest.importorskip("pyarrow")
+
+        register_df = pd.DataFrame(
+            {
+                "RiskID": ["R1"],
+                "FrequencyModel": ["Poisson"],
+                "FreqParam1": [1.0],
+                "SeverityModel": ["Lognormal"],
+                "SevParam1": [10.0],
+                "SevParam2": [0.5],
+            }
+        )
+        parquet_path = tmp_path / "test_register.parquet"
+        register_df.to_parquet(parquet_path)
+
+        df = load_register(str(parquet_path))
+
+        assert df["RiskID"].tolist() == ["R1"]
+        assert df["ResidualFactor"].iloc[0] == 1.0
+
+    def test_load_csv_in_chunks_matches_full_read(self):
+        """Test that chunked CSV loading gives the same register."""
+        sample_path = Path(__file__).parent.parent / "data" / "sample_risk_register.csv"
+        if not sample_path.exists():
+            pytest.skip("Sample data file not found")
+
+        full = load_register(str(sample_path))
+        chunked = load_register(str(sample_path), chunksize=3)
+
+        pd.testing.assert_frame_equal(chunked, full)
+
+    def test_load_from_dataframe(self):
+        """Test that an in-memory register is coerced and validated without file I/O."""
+        register_df = pd.DataFrame(
+            {
+                "RiskID": ["R1", "R2"],
+                "FrequencyModel": ["Poisson", "NegBin"],
+                "FreqParam1": [2.0, 3.0],
+                "FreqParam2": [None, "0.6"],
+                "SeverityModel": ["Lognormal", "Normal"],
+                "SevParam1": [12.0, 100000],
+                "SevParam2": [0.8, 30000],
+            }
+        )
+
+        df = load_register(register_df)
+
+        assert df["FreqParam2"].iloc[1] == 0.6
+        assert df["ResidualFactor"].tolist() == [1.0, 1.0]
+        assert "ResidualFactor" not in register_df.columns
+
+    def test_load_from_dataframe_validation_toggle(self):
+        """Test that validate=False skips register validation."""
+        register_df = pd.DataFrame(
+            {
+                "RiskID": ["R1"],
+                "FrequencyModel": ["InvalidModel"],
+                "FreqParam1": [1.0],
+                "SeverityModel": ["Lognormal"],
+                "SevParam1": [10.0],
+                "SevParam2": [0.5],
+            }
+        )
+
+        with pytest.raises(ValueError, match="Invalid frequency models"):
+            load_register(register_df)
+
+        assert len(load_register(register_df, validate=False)) == 1
+
     def test_load_nonexistent_file_raises(self):
         """Test that nonexistent file raises error."""
         with pytest.raises(FileNotFoundError):
@@ -162,6 +234,127 @@ class TestSaveQuantifiedRegister:
         assert result_df.iloc[-1]["RiskID"] == "PORTFOLIO_TOTAL"
         assert result_df.iloc[-1]["Category"] == "Portfolio"
 
+    def test_save_warns_once_for_unknown_risks(self, tmp_path):
+        """Test that simulated risks missing from the register are skipped with one warning."""
+        register_df = pd.DataFrame(
+            {
+                "RiskID": ["R1"],
+                "Category": ["Test"],
+                "FrequencyModel": ["Poisson"],
+                "FreqParam1": [1.0],
+                "SeverityModel": ["Lognormal"],
+                "SevParam1": [10.0],
+                "SevParam2": [0.5],
+            }
+        )
+
+        portfolio_df = pd.DataFrame(
+            {
+                "portfolio_loss": np.ones(100) * 3.0,
+                "by_risk:R1": np.ones(100),
+                "by_risk:X1": np.ones(100),
+                "by_risk:X2": np.ones(100),
+            }
+        )
+
+        out_path = tmp_path / "quantified.csv"
+        with pytest.warns(UserWarning, match="X1, X2") as record:
+            save_quantified_register(register_df, portfolio_df, str(out_path))
+
+        assert len(record) == 1
+        assert pd.read_csv(out_path)["RiskID"].tolist() == ["R1", "PORTFOLIO_TOTAL"]
+
+    @pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+    def test_save_binary_formats_round_trip(self, tmp_path, suffix):
+        """Test that Parquet/Feather output round-trips the metrics."""
+        pytest.importorskip("pyarrow")
+
+        register_df = pd.DataFrame(
+            {
+                "RiskID": ["R1"],
+                "Category": ["Test"],
+                "FrequencyModel": ["Poisson"],
+                "FreqParam1": [1.0],
+                "SeverityModel": ["Lognormal"],
+                "SevParam1": [10.0],
+                "SevParam2": [0.5],
+            }
+        )
+
+        portfolio_df = pd.DataFrame(
+            {
+                "portfolio_loss": np.random.lognormal(12, 1, 1000),
+                "by_risk:R1": np.random.lognormal(11, 0.8, 1000),
+            }
+        )
+
+        out_path = tmp_path / f"quantified{suffix}"
+        save_quantified_register(register_df, portfolio_df, str(out_path))
+
+        result_df = pd.read_parquet(out_path) if suffix == ".parquet" else pd.read_feather(out_path)
+
+        assert result_df["RiskID"].tolist() == ["R1", "PORTFOLIO_TOTAL"]
+        assert result_df["SimMean"].iloc[0] == pytest.approx(np.mean(portfolio_df["by_risk:R1"]))
+
+    def test_csv_writers_agree(self, tmp_path, monkeypatch):
+        """Test that both CSV writers read back to the same frame (no whole floats here)."""
+        pytest.importorskip("pyarrow")
+
+        df = pd.DataFrame(
+            {
+                "RiskID": ["R1", "R,2"],
+                "SimMean": [0.1 + 0.2, 1e6],
+                "Owner": ["Alice", np.nan],
+                "Active": [True, False],
+            }
+        )
+
+        arrow_path = tmp_path / "arrow.csv"
+        risk_io._write_csv(df, str(arrow_path))
+
+        monkeypatch.setattr(risk_io, "HAS_PYARROW", False)
+        pandas_path = tmp_path / "pandas.csv"
+        risk_io._write_csv(df, str(pandas_path))
+
+        pd.testing.assert_frame_equal(pd.read_csv(arrow_path), pd.read_csv(pandas_path))
+        pd.testing.assert_frame_equal(pd.read_csv(arrow_path), df)
+
+    def test_csv_writers_integral_floats(self, tmp_path, monkeypatch):
+        """Test that whole floats keep their values, though pyarrow drops the ".0"."""
+        pytest.importorskip("pyarrow")
+
+        df = pd.DataFrame({"RiskID": ["R1", "R2"], "SimMean": [50.0, 1e6]})
+
+        arrow_path = tmp_path / "arrow.csv"
+        risk_io._write_csv(df, str(arrow_path))
+
+        monkeypatch.setattr(risk_io, "HAS_PYARROW", False)
+        pandas_path = tmp_path / "pandas.csv"
+        risk_io._write_csv(df, str(pandas_path))
+
+        assert arrow_path.read_text().splitlines()[1] == '"R1",50'
+        assert pandas_path.read_text().splitlines()[1] == "R1,50.0"
+        pd.testing.assert_frame_equal(pd.read_csv(arrow_path), df, check_dtype=False)
+        pd.testing.assert_frame_equal(pd.read_csv(pandas_path), df)
+
+    def test_csv_unsupported_dtype_falls_back(self, tmp_path):
+        """Test that dtypes pyarrow does not implement (complex) are written by pandas."""
+        df = pd.DataFrame({"RiskID": ["R1"], "Value": [1 + 2j]})
+
+        out_path = tmp_path / "complex.csv"
+        risk_io._write_csv(df, str(out_path))
+
+        assert out_path.read_text().splitlines() == ["RiskID,Value", "R1,(1+2j)"]
+
+    def test_csv_mixed_object_column_falls_back(self, tmp_path):
+        """Test that columns pyarrow cannot convert are written by pandas."""
+        df = pd.DataFrame({"RiskID": ["R1", "R2"], "Notes": ["text", 3]})
+
+        out_path = tmp_path / "mixed.csv"
+        risk_io._write_csv(df, str(out_path))
+
+        assert pd.read_csv(out_path)["Notes"].tolist() == ["text", "3"]
+
 
 class TestValidateRegisterFormat:
     """Tests for validate_register_format function."""
@@ -10,7 +10,15 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from risk_mc.lec import exceedance_prob, lec_points, return_period
+from risk_mc.lec import (
+    LossCDF,
+    exceedance_prob,
+    exceedance_probs,
+    lec_points,
+    return_period,
+    return_periods,
+)
+from risk_mc.metrics import tvar
 
 
 class TestLECPoints:
@@ -59,6 +67,15 @@ class TestLECPoints:
         assert len(lec_df["loss"].unique()) == 1
         assert lec_df["loss"].iloc[0] == 100000.0
 
+    def test_lec_presorted_losses(self):
+        """Test that passing sorted_losses gives the same curve."""
+        losses = np.random.default_rng(1).lognormal(10, 1, 2000)
+
+        expected = lec_points(losses, n_points=50)
+        result = lec_points(losses, n_points=50, sorted_losses=np.sort(losses))
+
+        assert result.equals(expected)
+
     def test_lec_invalid_prob_raises(self):
         """Test that invalid probabilities raise error."""
         losses = np.random.lognormal(10, 0.5, 1000)
@@ -142,5 +159,60 @@ class TestReturnPeriod:
         assert period == 1.0
 
 
+class TestBatchedThresholds:
+    """Tests for exceedance_probs and return_periods."""
+
+    def test_batched_matches_scalar(self):
+        """Test that batched results equal the per-threshold functions."""
+        rng = np.random.default_rng(0)
+        losses = rng.lognormal(10, 1, 5000)
+        losses[:1000] = 0.0
+        thresholds = np.array([0.0, 1.0, 20000.0, np.median(losses), losses.max(), 1e12])
+
+        probs = exceedance_probs(losses, thresholds)
+        periods = return_periods(losses, thresholds)
+
+        np.testing.assert_array_equal(probs, [exceedance_prob(losses, t) for t in thresholds])
+        np.testing.assert_array_equal(periods, [return_period(losses, t) for t in thresholds])
+        assert periods[-1] == float("inf")
+
+
+class TestLossCDF:
+    """Tests for LossCDF."""
+
+    def test_quantile_matches_percentile(self):
+        """Test that quantiles equal np.percentile exactly."""
+        losses = np.random.default_rng(2).lognormal(10, 1, 3000)
+        cdf = LossCDF(losses)
+
+        qs = np.array([0.0, 0.5, 0.9, 0.95, 0.99, 1.0])
+        np.testing.assert_array_equal(cdf.quantile(qs), np.percentile(losses, qs * 100))
+        assert cdf.quantile(0.95) == np.percentile(losses, 95)
+
+    def test_exceedance_and_return_period(self):
+        """Test threshold queries against the single-threshold functions."""
+        losses = np.concatenate([np.zeros(900), np.ones(100)])
+        cdf = LossCDF(losses)
+
+        assert cdf.exceedance(0.5) == exceedance_prob(losses, 0.5)
+        assert cdf.return_period(0.5) == pytest.approx(10.0)
+        assert cdf.return_period(2.0) == float("inf")
+
+    def test_tvar_matches_tvar(self):
+        """Test that suffix-sum TVaR agrees with metrics.tvar, including ties."""
+        losses = np.random.default_rng(3).lognormal(10, 1, 5000)
+        losses[:2000] = 0.0
+        cdf = LossCDF(losses)
+
+        for confidence in [0.3, 0.95, 0.99, 0.999]:
+            assert cdf.tvar(confidence) == pytest.approx(tvar(losses, confidence), rel=1e-12)
+        assert cdf.tvar(np.array([0.95, 0.99])).shape == (2,)
+
+    def test_invalid_quantile_raises(self):
+        """Test that probabilities outside [0, 1] raise."""
+        with pytest.raises(ValueError):
+            LossCDF(np.arange(10.0)).quantile([0.5, 1.5])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,199 @@
+"""
+Unit tests for risk metrics module.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from risk_mc import metrics
+from risk_mc.metrics import (
+    contribution_analysis,
+    correlation_matrix,
+    marginal_contribution_to_var,
+    percentiles,
+    portfolio_summary,
+    summary,
+    tornado_data,
+    tvar,
+    var,
+)
+
+
+@pytest.fixture
+def losses():
+    """Lognormal losses with a block of zero-loss years (ties)."""
+    rng = np.random.default_rng(42)
+    values = rng.lognormal(11.0, 1.2, 20_000)
+    values[:6_000] = 0.0
+    return values
+
+
+class TestSummary:
+    """Tests for summary function."""
+
+    def test_percentiles_match_numpy(self, losses):
+        """Test that sorted-array quantiles match np.percentile exactly."""
+        stats = summary(losses)
+
+        expected = np.percentile(losses, [50, 90, 95, 99])
+        np.testing.assert_array_equal(stats[["p50", "p90", "p95", "p99"]].values, expected)
+        assert stats["median"] == pytest.approx(np.median(losses))
+
+    def test_var_and_tvar_consistent(self, losses):
+        """Test that summary VaR/TVaR agree with var() and tvar()."""
+        stats = summary(losses)
+
+        assert stats["var_95"] == pytest.approx(var(losses, 0.95))
+        assert stats["var_99"] == pytest.approx(var(losses, 0.99))
+        assert stats["tvar_95"] == pytest.approx(tvar(losses, 0.95))
+        assert stats["tvar_99"] == pytest.approx(tvar(losses, 0.99))
+
+    def test_min_max_mean_std(self, losses):
+        """Test basic moments and extremes."""
+        stats = summary(losses)
+
+        assert stats["min"] == losses.min()
+        assert stats["max"] == losses.max()
+        assert stats["mean"] == pytest.approx(losses.mean())
+        assert stats["std"] == pytest.approx(losses.std())
+
+    def test_float32_precision(self, losses):
+        """Test that float32 results stay close to float64 and come back as float64."""
+        stats = summary(losses, precision="float32")
+
+        assert stats.dtype == np.float64
+        pd.testing.assert_series_equal(stats, summary(losses), rtol=1e-6)
+        assert var(losses, 0.99, precision="float32") == pytest.approx(var(losses, 0.99), rel=1e-6)
+        assert tvar(losses, 0.99, precision="float32") == pytest.approx(
+            tvar(losses, 0.99), rel=1e-6
+        )
+
+        with pytest.raises(ValueError, match="precision"):
+            var(losses, precision="int8")
+
+    def test_numpy_fallback_matches(self, losses, monkeypatch):
+        """Test that the NumPy path agrees with the default (possibly compiled) path."""
+        default = summary(losses)
+
+        monkeypatch.setattr(metrics, "HAS_NUMBA", False)
+        pd.testing.assert_series_equal(summary(losses), default, rtol=1e-10)
+
+    def test_percentiles(self, losses):
+        """Test that percentiles() matches per-probability np.percentile and validates."""
+        probs = [0.1, 0.5, 0.99]
+        result = percentiles(losses, probs)
+
+        assert list(result) == probs
+        for p in probs:
+            assert result[p] == np.percentile(losses, p * 100)
+
+        with pytest.raises(ValueError, match="1.5"):
+            percentiles(losses, [0.5, 1.5])
+
+    def test_single_value(self):
+        """Test summary of a one-element array."""
+        stats = summary(np.array([5.0]))
+
+        assert stats["p99"] == 5.0
+        assert stats["tvar_99"] == 5.0
+
+
+@pytest.fixture
+def portfolio_df(losses):
+    """Portfolio frame with three risk columns built from the loss fixture."""
+    rng = np.random.default_rng(7)
+    by_risk = {
+        "by_risk:R1": losses,
+        "by_risk:R2": rng.permutation(losses) * 0.5,
+        "by_risk:R3": np.zeros_like(losses),
+    }
+    return pd.DataFrame({"portfolio_loss": sum(by_risk.values()), **by_risk})
+
+
+class TestPortfolioSummary:
+    """Tests for portfolio_summary and contribution_analysis."""
+
+    def test_matches_per_column_summary(self, portfolio_df):
+        """Test that column-wise stats agree with summary() on each column."""
+        result = portfolio_summary(portfolio_df)
+
+        assert result.index.tolist() == ["Portfolio", "R1", "R2", "R3"]
+        for label, col in zip(result.index, portfolio_df.columns):
+            expected = summary(portfolio_df[col].values, label)
+            pd.testing.assert_series_equal(result.loc[label], expected, rtol=1e-12)
+
+    def test_contribution_analysis(self, portfolio_df):
+        """Test contribution ordering and percentages."""
+        result = contribution_analysis(portfolio_df, top_n=2)
+
+        assert result["risk_id"].tolist() == ["R1", "R2"]
+        assert result["var_95"].iloc[0] == pytest.approx(var(portfolio_df["by_risk:R1"].values))
+        assert result["contribution_pct"].sum() == pytest.approx(100.0)
+
+    def test_correlation_matrix_matches_pandas(self, portfolio_df):
+        """Test that correlation_matrix agrees with DataFrame.corr, including NaN risks."""
+        result = correlation_matrix(portfolio_df)
+
+        risk_data = portfolio_df.drop(columns="portfolio_loss")
+        expected = risk_data.rename(columns=lambda x: x.replace("by_risk:", "")).corr()
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-12)
+
+    def test_marginal_contribution_to_var(self, portfolio_df):
+        """Test tail-mean contributions, constant risks and the portfolio key."""
+        portfolio_losses = portfolio_df["portfolio_loss"].values
+        by_risk = {col.replace("by_risk:", ""): portfolio_df[col].values for col in portfolio_df}
+        by_risk["portfolio"] = by_risk.pop("portfolio_loss")
+
+        result = marginal_contribution_to_var(by_risk, portfolio_losses, 0.95)
+
+        tail = portfolio_losses >= var(portfolio_losses, 0.95)
+        assert list(result) == ["R1", "R2", "R3"]
+        assert result["R1"] == pytest.approx(by_risk["R1"][tail].mean())
+        assert result["R2"] == pytest.approx(by_risk["R2"][tail].mean())
+        assert result["R3"] == 0.0
+
+    def test_tornado_data(self, portfolio_df):
+        """Test categories (first match, Unknown fallback) and metric columns."""
+        portfolio_losses = portfolio_df["portfolio_loss"].values
+        by_risk = {f"R{i}": portfolio_df[f"by_risk:R{i}"].values for i in (1, 2, 3)}
+        register_df = pd.DataFrame(
+            {"RiskID": ["R1", "R2", "R2"], "Category": ["Cyber", "Ops", "Other"]}
+        )
+
+        result = tornado_data(register_df, portfolio_losses, by_risk, top_n=3)
+
+        assert result["risk_id"].tolist() == ["R1", "R2", "R3"]
+        assert result["category"].tolist() == ["Cyber", "Ops", "Unknown"]
+        assert result["mean_loss"].iloc[0] == pytest.approx(by_risk["R1"].mean())
+        expected_dvar = marginal_contribution_to_var(by_risk, portfolio_losses)
+        assert result.set_index("risk_id")["dvar"].to_dict() == pytest.approx(expected_dvar)
+
+    def test_float32_precision(self, portfolio_df):
+        """Test that float32 metrics stay close and are returned as float64."""
+        result = portfolio_summary(portfolio_df, precision="float32")
+        expected = portfolio_summary(portfolio_df)
+
+        assert (result.dtypes == np.float64).all()
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-6)
+
+        with pytest.raises(ValueError, match="precision"):
+            portfolio_summary(portfolio_df, precision="float16")
+
+    def test_numpy_fallback_matches(self, portfolio_df, monkeypatch):
+        """Test that the NumPy path agrees with the default (possibly compiled) path."""
+        default = portfolio_summary(portfolio_df)
+
+        monkeypatch.setattr(metrics, "HAS_NUMBA", False)
+        fallback = portfolio_summary(portfolio_df)
+
+        pd.testing.assert_frame_equal(default, fallback, rtol=1e-10)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
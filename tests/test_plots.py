@@ -0,0 +1,150 @@
+"""
+Unit tests for plotting utilities.
+"""
+
+import sys
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")  # Use non-interactive backend for testing
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from risk_mc.plots import (
+    _fast_kde,
+    _plot_sample,
+    compare_distributions,
+    frequency_severity_scatter,
+    loss_histogram,
+    loss_histogram_plotly,
+)
+
+
+@pytest.fixture
+def losses():
+    """Lognormal losses with a block of zero-loss years."""
+    rng = np.random.default_rng(42)
+    values = rng.lognormal(11.0, 0.8, 20_000)
+    values[:4_000] = 0.0
+    return values
+
+
+class TestFastKDE:
+    """Tests for the binned FFT KDE."""
+
+    def test_matches_gaussian_kde(self, losses):
+        """Test that the binned KDE tracks scipy's exact KDE."""
+        x_grid = np.linspace(losses.min(), losses.max(), 200)
+
+        expected = stats.gaussian_kde(losses)(x_grid)
+        result = _fast_kde(losses, x_grid)
+
+        np.testing.assert_allclose(result, expected, atol=0.01 * expected.max())
+
+    def test_constant_losses(self):
+        """Test that losses without spread give a flat zero density."""
+        x_grid = np.linspace(0, 1, 5)
+        np.testing.assert_array_equal(_fast_kde(np.full(100, 3.0), x_grid), np.zeros(5))
+
+
+class TestPlotSample:
+    """Tests for plot downsampling."""
+
+    def test_subsample_is_deterministic(self, losses):
+        """Test that large inputs are subsampled reproducibly without replacement."""
+        sample = _plot_sample(losses, 1000)
+
+        assert len(sample) == 1000
+        np.testing.assert_array_equal(sample, _plot_sample(losses, 1000))
+        assert np.isin(sample, losses).all()
+
+    def test_small_or_disabled_keeps_all(self, losses):
+        """Test that small inputs and max_plot_points=None are left untouched."""
+        assert _plot_sample(losses, None) is losses
+        assert len(_plot_sample(losses[:10], 1000)) == 10
+
+
+class TestLossHistogram:
+    """Tests for loss_histogram."""
+
+    def test_kde_and_percentiles(self, losses):
+        """Test the figure has the histogram, KDE line and percentile marks."""
+        fig = loss_histogram(losses, mark_percentiles=[0.95, 0.99])
+
+        ax = fig.axes[0]
+        labels = [line.get_label() for line in ax.get_lines()]
+        assert labels[0] == "KDE"
+        assert labels[1].startswith("P95: ")
+        assert labels[2].startswith("P99: ")
+        plt.close(fig)
+
+    def test_percentiles_use_full_array(self, losses):
+        """Test that percentile marks come from all losses, not the plot sample."""
+        fig = loss_histogram(losses, kde=False, mark_percentiles=[0.99], max_plot_points=500)
+
+        (line,) = fig.axes[0].get_lines()
+        assert line.get_xdata()[0] == np.percentile(losses, 99)
+        plt.close(fig)
+
+    def test_draws_all_losses_by_default(self, losses):
+        """Test that the default histogram bins every loss, tail included."""
+        fig = loss_histogram(losses, kde=False)
+
+        heights = [patch.get_height() for patch in fig.axes[0].patches]
+        np.testing.assert_allclose(heights, np.histogram(losses, bins=50, density=True)[0])
+        plt.close(fig)
+
+    def test_plotly_bins_all_losses(self, losses):
+        """Test that the plotly histogram sends pre-binned densities of every loss."""
+        fig = loss_histogram_plotly(losses, bins=40)
+
+        (bars,) = fig.data
+        density, edges = np.histogram(losses, bins=40, density=True)
+        np.testing.assert_allclose(bars.y, density)
+        np.testing.assert_allclose(bars.x, (edges[:-1] + edges[1:]) / 2)
+        np.testing.assert_allclose(bars.width, np.diff(edges))
+
+    def test_plotly_percentile_marks(self, losses):
+        """Test that the plotly histogram marks each requested percentile."""
+        fig = loss_histogram_plotly(losses, mark_percentiles=[0.5, 0.95, 0.99])
+
+        marks = [shape.x0 for shape in fig.layout.shapes]
+        np.testing.assert_array_equal(marks, np.percentile(losses, [50, 95, 99]))
+
+    def test_compare_distributions(self, losses):
+        """Test one histogram panel per distribution."""
+        fig = compare_distributions({"A": losses, "B": losses * 2}, max_plot_points=1000)
+
+        assert len(fig.axes) == 2
+        plt.close(fig)
+
+
+class TestFrequencySeverityScatter:
+    """Tests for frequency_severity_scatter."""
+
+    def test_points_match_per_risk_estimates(self, losses):
+        """Test frequency and mean severity per risk, skipping unsimulated risks."""
+        portfolio_df = pd.DataFrame(
+            {"by_risk:R1": losses, "by_risk:R2": np.zeros_like(losses), "by_risk:R9": losses}
+        )
+        register_df = pd.DataFrame({"RiskID": ["R1", "R2", "R3"]})
+
+        fig = frequency_severity_scatter(register_df, portfolio_df)
+
+        points = fig.axes[0].collections[0].get_offsets()
+        nonzero = losses[losses > 0]
+        np.testing.assert_allclose(points[0], [nonzero.mean(), len(nonzero) / len(losses)])
+        np.testing.assert_array_equal(points[1], [0.0, 0.0])
+        assert len(points) == 2
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
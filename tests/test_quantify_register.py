@@ -11,7 +11,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from risk_mc import load_register, quantify_register
+from risk_mc import load_register, quantify_register, simulate_portfolio
 
 
 class TestQuantifyRegister:
@@ -92,6 +92,32 @@ class TestQuantifyRegister:
         # Check that SimMean values match
         np.testing.assert_array_almost_equal(result1["SimMean"].values, result2["SimMean"].values)
 
+    def test_quantify_threaded_matches_serial(self, sample_register):
+        """Test that simulating risks on several threads gives the same results."""
+        serial = quantify_register(sample_register, n_sims=1000, seed=42)
+        threaded = quantify_register(sample_register, n_sims=1000, seed=42, n_jobs=3)
+
+        pd.testing.assert_frame_equal(serial, threaded)
+
+    def test_quantify_reuses_portfolio_samples(self, sample_register):
+        """Test that a pre-simulated portfolio gives the same results as simulating."""
+        portfolio_df = simulate_portfolio(sample_register, n_sims=1000, seed=42)
+
+        result = quantify_register(sample_register, portfolio_df=portfolio_df)
+
+        pd.testing.assert_frame_equal(
+            result, quantify_register(sample_register, n_sims=1000, seed=42)
+        )
+
+    def test_quantify_keeps_categorical_category(self, sample_register):
+        """Test that a categorical Category column stays categorical with the portfolio row."""
+        register = sample_register.astype({"Category": "category"})
+
+        result = quantify_register(register, n_sims=1000, seed=42)
+
+        assert isinstance(result["Category"].dtype, pd.CategoricalDtype)
+        assert result["Category"].tolist() == ["Cyber", "Ops", "Financial", "Portfolio"]
+
     def test_quantify_percentile_ordering(self, sample_register):
         """Test that percentiles are properly ordered."""
         result = quantify_register(sample_register, n_sims=5000, seed=42)
@@ -2,15 +2,26 @@
 Tests for Risk Register Integration module
 """
 
+import os
 import sys
+import warnings
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from risk_mc.io import load_register, quantify_register, save_quantified_register
+import risk_register
+from risk_mc.io import (
+    compare_scenarios,
+    load_register,
+    quantify_register,
+    save_quantified_register,
+)
+from risk_mc.simulate import simulate_portfolio
+from risk_register import RiskRegister
 
 
 class TestLoadRegister:
@@ -312,7 +323,6 @@ class TestGetRiskSummary:
         assert "PORTFOLIO_TOTAL" not in summary["RiskID"].values
 
 
-@pytest.mark.skip(reason="compare_scenarios function not implemented in current version")
 class TestCompareScenarios:
     """Tests for compare_scenarios function."""
 
@@ -349,6 +359,386 @@ class TestCompareScenarios:
         high_freq_mean = comparison[comparison["scenario"] == "High_Freq"]["mean"].iloc[0]
         assert high_freq_mean > base_mean
 
+    def test_base_matches_simulation(self, base_register):
+        """Test that the base row and untouched risks reuse the seeded simulation."""
+        scenarios = {"No_Change": {"R2": {}}}
+
+        comparison = compare_scenarios(base_register, scenarios, n_sims=1000, seed=42)
+
+        portfolio = simulate_portfolio(base_register, n_sims=1000, seed=42)["portfolio_loss"]
+        assert comparison["mean"].iloc[0] == pytest.approx(portfolio.mean())
+        pd.testing.assert_series_equal(
+            comparison.iloc[0, 1:], comparison.iloc[1, 1:], check_names=False
+        )
+
+    def test_unknown_risk_raises(self, base_register):
+        """Test that overriding a risk missing from the register raises."""
+        with pytest.raises(ValueError, match="R9"):
+            compare_scenarios(base_register, {"Bad": {"R9": {"FreqParam1": 1.0}}}, n_sims=100)
+
+    def test_duplicate_risk_ids_raise(self, base_register):
+        """Test that a register with a repeated RiskID is rejected up front."""
+        register = pd.concat([base_register, base_register.iloc[[0]]], ignore_index=True)
+
+        with pytest.raises(ValueError, match="repeated: R1"):
+            compare_scenarios(register, {"High_Freq": {"R2": {"FreqParam1": 3.0}}}, n_sims=100)
+
+
+class TestRiskRegister:
+    """Tests for the RiskRegister class, against the results of its original implementation."""
+
+    @pytest.fixture
+    def risks(self):
+        """Create a register with tied category counts and integer impacts."""
+        return pd.DataFrame(
+            {
+                "risk_id": ["R1", "R2", "R3", "R4", "R5"],
+                "risk_name": ["Outage", "Phishing", "Fraud", "Breach", "Lawsuit"],
+                "category": ["Ops", "Cyber", "Ops", "Cyber", "Legal"],
+                "likelihood": [0.2, 0.5, 0.1, 0.4, 0.3],
+                "impact": [100, 400, 250, 50, 200],
+                "owner": ["Ann", "Bo", "Ann", "Cy", "Di"],
+                "status": ["Active", "Closed", "Active", "Active", "Closed"],
+            }
+        )
+
+    @pytest.fixture
+    def register(self, risks):
+        """Create a RiskRegister loaded with the sample risks."""
+        register = RiskRegister()
+        register.load_from_dataframe(risks)
+        return register
+
+    def test_load_from_csv_parsers_agree(self, tmp_path, monkeypatch, risks):
+        """Test that the pyarrow and C parsers load the same register."""
+        pytest.importorskip("pyarrow")
+
+        csv_path = tmp_path / "register.csv"
+        risks.assign(
+            risk_name=["Outage", "Phishing, email", "Fraud", "Breach", "Lawsuit"],
+            impact=[100, None, 250, 50, 200],
+        ).to_csv(csv_path, index=False)
+
+        arrow_df = RiskRegister().load_from_csv(str(csv_path))
+        monkeypatch.setattr(risk_register, "HAS_PYARROW", False)
+        c_df = RiskRegister().load_from_csv(str(csv_path))
+
+        pd.testing.assert_frame_equal(arrow_df, c_df)
+        assert arrow_df["risk_name"].iloc[1] == "Phishing, email"
+        assert pd.isna(arrow_df["inherent_risk_score"].iloc[1])
+
+    def test_load_from_csv_error(self, tmp_path):
+        """Test that unreadable CSV files raise ValueError."""
+        with pytest.raises(ValueError, match="Error loading CSV file"):
+            RiskRegister().load_from_csv(str(tmp_path / "missing.csv"))
+
+    def test_load_from_excel_cache(self, tmp_path, risks):
+        """Test that unchanged workbooks are parsed once and edits are picked up."""
+        pytest.importorskip("openpyxl")
+
+        excel_path = tmp_path / "register.xlsx"
+        risks.to_excel(excel_path, index=False)
+        risk_register._read_excel_cached.cache_clear()
+
+        register = RiskRegister()
+        first = register.load_from_excel(str(excel_path))
+        register.original_df.loc[0, "impact"] = 0
+        second = register.load_from_excel(excel_path)
+
+        assert risk_register._read_excel_cached.cache_info().hits == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert second["impact"].iloc[0] == 100
+
+        # A rewritten file has a new modification time, so it is parsed again
+        risks.assign(impact=[1, 2, 3, 4, 5]).to_excel(excel_path, index=False)
+        mtime_ns = excel_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(excel_path, ns=(mtime_ns, mtime_ns))
+        assert register.load_from_excel(str(excel_path))["impact"].tolist() == [1, 2, 3, 4, 5]
+
+        # File objects (uploads) are read directly
+        with open(excel_path, "rb") as f:
+            pd.testing.assert_frame_equal(RiskRegister().load_from_excel(f), register.get_risks())
+
+    def test_load_from_dataframe_defaults(self):
+        """Test the default columns and values filled in for a minimal register."""
+        df = pd.DataFrame({"likelihood": [0.5, "x"], "impact": [10, 20]})
+
+        risks = RiskRegister().load_from_dataframe(df)
+
+        expected = pd.DataFrame(
+            {
+                "likelihood": [0.5, np.nan],
+                "impact": [10, 20],
+                "risk_id": ["R001", "R002"],
+                "risk_name": ["Risk 1", "Risk 2"],
+                "likelihood_std": [0.1, 0.1],
+                "impact_min": [5.0, 10.0],
+                "impact_most_likely": [10, 20],
+                "impact_max": [15.0, 30.0],
+                "inherent_risk_score": [5.0, np.nan],
+                "residual_risk_score": [3.5, np.nan],
+                "category": ["General", "General"],
+                "owner": ["Unassigned", "Unassigned"],
+                "status": ["Active", "Active"],
+            }
+        )
+        categorical = ["category", "owner", "status"]
+        pd.testing.assert_frame_equal(risks.astype(dict.fromkeys(categorical, object)), expected)
+        # The caller's frame is left as it was
+        assert list(df.columns) == ["likelihood", "impact"]
+
+    def test_original_df_is_unchanged_snapshot(self, tmp_path, risks):
+        """Test that original_df keeps the frame as loaded through cleaning and edits."""
+        register = RiskRegister()
+        register.load_from_dataframe(risks)
+        expected = risks.copy()
+
+        risks.loc[0, "impact"] = 0
+        register.update_risk("R1", {"impact": 999})
+        register.add_risk({"risk_id": "R6", "likelihood": 0.5, "impact": 10})
+        register.delete_risk("R2")
+
+        pd.testing.assert_frame_equal(register.original_df, expected)
+
+        csv_path = tmp_path / "register.csv"
+        expected.to_csv(csv_path, index=False)
+        register.load_from_csv(str(csv_path))
+        register.update_risk("R1", {"impact": 999})
+
+        pd.testing.assert_frame_equal(register.original_df, expected)
+
+    def test_categorical_filters(self, register):
+        """Test that category and status filters select the same rows as text columns."""
+        risks = register.get_risks()
+
+        assert isinstance(risks["category"].dtype, pd.CategoricalDtype)
+        assert register.filter_by_category("Ops")["risk_id"].tolist() == ["R1", "R3"]
+        assert register.filter_by_status("Closed")["risk_id"].tolist() == ["R2", "R5"]
+        assert register.filter_by_category("Unknown").empty
+
+    def test_update_risk_new_category(self, register):
+        """Test that updating to a value not yet seen adds it as a category."""
+        register.update_risk("R1", {"category": "Climate", "status": "Closed", "impact": 150})
+
+        risk = register.get_risks().set_index("risk_id").loc["R1"]
+
+        assert (risk["category"], risk["status"], risk["impact"]) == ("Climate", "Closed", 150)
+        assert register.filter_by_category("Climate")["risk_id"].tolist() == ["R1"]
+        assert register.get_summary_statistics()["category_breakdown"]["Climate"] == 1
+
+    def test_update_risk_drops_vacated_category(self, register):
+        """Test that moving the last risk out of a category removes that category."""
+        register.update_risk("R5", {"category": "Ops", "owner": "Ann"})
+
+        risks = register.get_risks()
+
+        assert risks["category"].value_counts().to_dict() == {"Ops": 3, "Cyber": 2}
+        assert "Legal" not in risks["category"].cat.categories
+        assert "Di" not in risks["owner"].cat.categories
+
+    def test_delete_risk_drops_unused_categories(self, register):
+        """Test that deleting the last risk of a category removes that category."""
+        register.delete_risk("R5")
+
+        risks = register.get_risks()
+
+        assert risks["risk_id"].tolist() == ["R1", "R2", "R3", "R4"]
+        assert list(risks["category"].cat.categories) == ["Cyber", "Ops"]
+        assert "Di" not in risks["owner"].cat.categories
+        assert register.get_summary_statistics()["categories"] == 2
+
+    @pytest.mark.parametrize("threshold", [0.0, 0.3, 0.5, 0.7, 0.95, 1.0])
+    def test_high_priority_matches_quantile(self, threshold):
+        """Test that the partition cut-off selects the rows Series.quantile did."""
+        scores = np.random.default_rng(0).lognormal(3, 1, 200)
+        scores[::17] = np.nan
+        scores[1::23] = scores[2]  # ties
+        register = RiskRegister()
+        register.load_from_dataframe(
+            pd.DataFrame({"likelihood": 0.5, "impact": 100, "residual_risk_score": scores})
+        )
+        risks = register.get_risks()
+
+        high = register.get_high_priority_risks(threshold)
+
+        expected = risks[
+            risks["residual_risk_score"] >= risks["residual_risk_score"].quantile(threshold)
+        ]
+        pd.testing.assert_frame_equal(high, expected)
+
+    @pytest.mark.parametrize("threshold", [-0.5, -1e-9, 1 + 1e-9, 1.5])
+    def test_high_priority_threshold_out_of_range(self, register, threshold):
+        """Test that thresholds outside [0, 1] raise instead of selecting rows."""
+        with pytest.raises(ValueError, match=r"threshold must be in \[0, 1\]"):
+            register.get_high_priority_risks(threshold)
+
+    def test_high_priority_edge_cases(self, register):
+        """Test the default threshold, a single risk and a register without scores."""
+        assert register.get_high_priority_risks()["risk_id"].tolist() == ["R2", "R5"]
+
+        single = RiskRegister()
+        single.load_from_dataframe(pd.DataFrame({"likelihood": [0.5], "impact": [10]}))
+        assert len(single.get_high_priority_risks(0.9)) == 1
+
+        unscored = RiskRegister()
+        unscored.load_from_dataframe(pd.DataFrame({"likelihood": [0.5], "impact": [None]}))
+        assert unscored.get_high_priority_risks().empty
+
+    def test_export_writers_agree(self, tmp_path, monkeypatch, register):
+        """Test that pyarrow and pandas exports read back the same, though formatted differently."""
+        pytest.importorskip("pyarrow")
+
+        arrow_path = tmp_path / "arrow.csv"
+        register.export_to_csv(str(arrow_path))
+        monkeypatch.setattr(risk_register, "HAS_PYARROW", False)
+        pandas_path = tmp_path / "pandas.csv"
+        register.export_to_csv(str(pandas_path))
+
+        # impact_min of R1 is the whole float 50.0
+        assert arrow_path.read_text().splitlines()[1].startswith('"R1","Outage","Ops",0.2,100,')
+        assert ",50," in arrow_path.read_text().splitlines()[1]
+        assert pandas_path.read_text().splitlines()[1].startswith("R1,Outage,Ops,0.2,100,")
+        assert ",50.0," in pandas_path.read_text().splitlines()[1]
+        pd.testing.assert_frame_equal(
+            pd.read_csv(arrow_path), pd.read_csv(pandas_path), check_dtype=False
+        )
+
+    def test_export_mixed_column_falls_back(self, tmp_path, register):
+        """Test that columns pyarrow cannot convert are written by pandas."""
+        register.update_risk("R1", {"risk_name": 7})
+
+        out_path = tmp_path / "export.csv"
+        register.export_to_csv(str(out_path))
+
+        assert pd.read_csv(out_path)["risk_name"].tolist()[:2] == ["7", "Phishing"]
+
+    def test_export_quantified_matches_merge(self, tmp_path, monkeypatch, register):
+        """Test that joining quantified results exports what the left merge did."""
+        monkeypatch.setattr(risk_register, "HAS_PYARROW", False)
+        register.delete_risk("R2")
+        quantified = pd.DataFrame(
+            {
+                "risk_id": ["R5", "R1", "R1", "R9"],
+                "impact": [1.0, 2.0, 3.0, 4.0],
+                "SimMean": [10.0, 20.0, 30.0, 40.0],
+            }
+        )
+
+        out_path = tmp_path / "export.csv"
+        register.export_to_csv(str(out_path), include_quantified=True, quantified_df=quantified)
+
+        expected = register.get_risks().merge(
+            quantified, on="risk_id", how="left", suffixes=("", "_quantified")
+        )
+        assert out_path.read_text() == expected.to_csv(index=False)
+        assert pd.read_csv(out_path)["risk_id"].tolist() == ["R1", "R1", "R3", "R4", "R5"]
+
+    def test_risk_matrix_data_is_independent(self, register):
+        """Test that the matrix data can be edited without warnings or touching the register."""
+        matrix = register.get_risk_matrix_data()
+
+        assert list(matrix.columns) == [
+            "risk_id",
+            "risk_name",
+            "category",
+            "likelihood",
+            "impact",
+            "inherent_risk_score",
+            "residual_risk_score",
+        ]
+        pd.testing.assert_frame_equal(matrix, register.get_risks()[matrix.columns])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            matrix.loc[matrix["risk_id"] == "R1", "impact"] = 0
+            matrix["size"] = matrix["impact"] * 2
+
+        assert register.get_risks()["impact"].iloc[0] == 100
+        assert "size" not in register.get_risks().columns
+
+    def test_add_risk_matches_immediate_append(self, register, risks):
+        """Test that queued risks give the register that appending each one would."""
+        new_risks = [
+            {"risk_id": "R6", "category": "Cyber", "likelihood": 0.6, "impact": 300},
+            {"risk_id": "R7", "category": "Fraud", "likelihood": 0.2},
+        ]
+        for risk in new_risks:
+            register.add_risk(risk)
+
+        # The original add_risk appended each risk to the cleaned register and cleaned again
+        expected = RiskRegister()
+        expected.load_from_dataframe(risks)
+        for risk in new_risks:
+            expected.load_from_dataframe(
+                pd.concat([expected.get_risks(), pd.DataFrame([risk])], ignore_index=True)
+            )
+        pd.testing.assert_frame_equal(
+            register.get_risks().astype(object), expected.get_risks().astype(object)
+        )
+        assert register.get_risks()["risk_id"].tolist()[-2:] == ["R6", "R7"]
+
+    def test_add_risk_to_empty_register(self):
+        """Test that risks added before any load become the register."""
+        register = RiskRegister()
+        register.add_risk({"likelihood": 0.5, "impact": 100})
+        register.add_risk({"likelihood": 0.1})
+
+        risks = register.get_risks()
+
+        assert risks["risk_id"].tolist() == ["R001", "R002"]
+        assert risks["inherent_risk_score"].iloc[0] == 50.0
+        assert pd.isna(risks["inherent_risk_score"].iloc[1])
+
+    def test_add_risk_missing_column_raises_immediately(self, register):
+        """Test that a risk the register cannot clean is rejected by add_risk itself."""
+        empty = RiskRegister()
+
+        with pytest.raises(KeyError, match="impact"):
+            empty.add_risk({"risk_id": "R1", "likelihood": 0.5})
+        with pytest.raises(ValueError, match="No risk data loaded"):
+            empty.get_risks()
+
+        # The loaded register already has an impact column to fill from
+        register.add_risk({"risk_id": "R6", "likelihood": 0.5})
+        assert len(register.get_risks()) == 6
+
+    def test_load_discards_queued_risks(self, register, risks):
+        """Test that loading a new register drops risks queued for the old one."""
+        register.add_risk({"risk_id": "R6", "likelihood": 0.5, "impact": 10})
+
+        register.load_from_dataframe(risks)
+
+        assert register.get_risks()["risk_id"].tolist() == risks["risk_id"].tolist()
+
+    def test_summary_statistics_match_original(self, register):
+        """Test the summary values, types and category order of the original implementation."""
+        stats = register.get_summary_statistics()
+
+        assert stats == {
+            "total_risks": 5,
+            "active_risks": 3,
+            "avg_likelihood": pytest.approx(0.3),
+            "avg_impact": 200.0,
+            "avg_inherent_score": pytest.approx(65.0),
+            "avg_residual_score": pytest.approx(45.5),
+            "total_potential_impact": 1000,
+            "categories": 3,
+            "category_breakdown": {"Ops": 2, "Cyber": 2, "Legal": 1},
+        }
+        # An integer impact column keeps an integer total
+        assert isinstance(stats["total_potential_impact"], (int, np.integer))
+        # Tied counts keep their order of first appearance, not category order
+        assert list(stats["category_breakdown"]) == ["Ops", "Cyber", "Legal"]
+
+    def test_summary_statistics_skip_deleted_and_missing_categories(self, register):
+        """Test that categories without risks are neither counted nor listed."""
+        register.update_risk("R5", {"category": None})
+
+        stats = register.get_summary_statistics()
+
+        assert stats["categories"] == 2
+        assert stats["category_breakdown"] == {"Ops": 2, "Cyber": 2}
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
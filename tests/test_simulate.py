@@ -11,7 +11,8 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from risk_mc.simulate import simulate_annual_loss, simulate_portfolio
+from risk_mc import simulate
+from risk_mc.simulate import simulate_annual_loss, simulate_portfolio, simulate_risk_batch
 
 
 class TestSimulateAnnualLoss:
@@ -203,6 +204,50 @@ class TestSimulateAnnualLoss:
         with pytest.raises(ValueError, match="ResidualFactor"):
             simulate_annual_loss(risk, n_sims=100, seed=42)
 
+    def test_matches_per_simulation_sums(self):
+        """Test that each annual loss is the sum of that simulation's event severities."""
+        risk = pd.Series(
+            {
+                "RiskID": "R_TEST",
+                "FrequencyModel": "Poisson",
+                "FreqParam1": 3.0,
+                "SeverityModel": "Lognormal",
+                "SevParam1": 10.0,
+                "SevParam2": 1.0,
+                "ResidualFactor": 0.8,
+                "ControlEffectiveness": 0.25,
+            }
+        )
+
+        losses = simulate_annual_loss(risk, n_sims=500, seed=7)
+
+        # Same stream: counts first, then every event's severity in simulation order
+        rng = np.random.default_rng(7)
+        counts = rng.poisson(3.0, size=500)
+        severities = rng.lognormal(10.0, 1.0, size=counts.sum()) * 0.8 * 0.75
+        expected = [chunk.sum() for chunk in np.split(severities, np.cumsum(counts)[:-1])]
+
+        np.testing.assert_allclose(losses, expected, rtol=1e-12)
+
+    def test_numpy_aggregation_matches(self, monkeypatch):
+        """Test that the NumPy aggregation agrees with the default (possibly compiled) path."""
+        risk = pd.Series(
+            {
+                "FrequencyModel": "NegBin",
+                "FreqParam1": 2.0,
+                "FreqParam2": 0.4,
+                "SeverityModel": "Normal",
+                "SevParam1": 50000,
+                "SevParam2": 20000,
+            }
+        )
+        default = simulate_annual_loss(risk, n_sims=2000, seed=3)
+
+        monkeypatch.setattr(simulate, "HAS_NUMBA", False)
+        fallback = simulate_annual_loss(risk, n_sims=2000, seed=3)
+
+        np.testing.assert_allclose(default, fallback, rtol=1e-12)
+
 
 class TestSimulatePortfolio:
     """Tests for simulate_portfolio function."""
@@ -237,15 +282,15 @@ class TestSimulatePortfolio:
         assert "by_risk:R3" in result.columns
 
     def test_portfolio_is_sum_of_risks(self, sample_register):
-        """Test that portfolio loss equals sum of individual risks."""
-        result = simulate_portfolio(sample_register, n_sims=1000, seed=42)
+        """Test that portfolio loss equals sum of individual risks, across several tiles."""
+        result = simulate_portfolio(sample_register, n_sims=40_000, seed=42)
 
         portfolio = result["portfolio_loss"].values
         risk_sum = (
             result["by_risk:R1"].values + result["by_risk:R2"].values + result["by_risk:R3"].values
         )
 
-        np.testing.assert_array_almost_equal(portfolio, risk_sum)
+        np.testing.assert_array_equal(portfolio, risk_sum)
 
     def test_portfolio_deterministic_with_seed(self, sample_register):
         """Test deterministic results with seed."""
@@ -256,6 +301,67 @@ class TestSimulatePortfolio:
             result1["portfolio_loss"].values, result2["portfolio_loss"].values
         )
 
+    def test_risks_use_spawned_streams(self, sample_register):
+        """Test that each risk column comes from its own SeedSequence child."""
+        result = simulate_portfolio(sample_register, n_sims=1000, seed=42)
+
+        children = np.random.SeedSequence(42).spawn(len(sample_register))
+        for (_, risk_row), child in zip(sample_register.iterrows(), children):
+            expected = simulate_annual_loss(risk_row, n_sims=1000, rng=np.random.default_rng(child))
+            np.testing.assert_array_equal(result[f"by_risk:{risk_row['RiskID']}"], expected)
+
+    def test_repeated_risk_id_keeps_one_column(self, sample_register):
+        """Test that a repeated RiskID gives one column but every row counts in the total."""
+        register = pd.concat([sample_register, sample_register.iloc[[0]]], ignore_index=True)
+
+        result = simulate_portfolio(register, n_sims=500, seed=1)
+
+        assert result.columns.tolist() == [
+            "portfolio_loss",
+            "by_risk:R1",
+            "by_risk:R2",
+            "by_risk:R3",
+        ]
+        children = np.random.SeedSequence(1).spawn(len(register))
+        first_r1, last_r1 = (
+            simulate_annual_loss(
+                register.iloc[i], n_sims=500, rng=np.random.default_rng(children[i])
+            )
+            for i in (0, 3)
+        )
+        np.testing.assert_array_equal(result["by_risk:R1"], last_r1)
+        np.testing.assert_allclose(
+            result["portfolio_loss"], result.iloc[:, 1:].sum(axis=1) + first_r1, rtol=1e-12
+        )
+
+    def test_float32_precision(self, sample_register):
+        """Test float32 storage keeps the same draws to single precision."""
+        result = simulate_portfolio(sample_register, n_sims=500, seed=5, precision="float32")
+        expected = simulate_portfolio(sample_register, n_sims=500, seed=5)
+
+        assert (result.dtypes == np.float32).all()
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+        with pytest.raises(ValueError, match="precision"):
+            simulate_portfolio(sample_register, n_sims=10, precision="float16")
+
+    def test_risk_batch_matches_portfolio(self, sample_register):
+        """Test that simulate_risk_batch returns the simulate_portfolio columns as arrays."""
+        batch = simulate_risk_batch(sample_register, n_sims=500, seed=9)
+        result = simulate_portfolio(sample_register, n_sims=500, seed=9)
+
+        assert list(batch) == ["portfolio", "R1", "R2", "R3"]
+        np.testing.assert_array_equal(batch["portfolio"], result["portfolio_loss"])
+        for risk_id in ["R1", "R2", "R3"]:
+            np.testing.assert_array_equal(batch[risk_id], result[f"by_risk:{risk_id}"])
+
+    def test_threaded_matches_serial(self, sample_register):
+        """Test that n_jobs does not change the simulated losses."""
+        serial = simulate_portfolio(sample_register, n_sims=2000, seed=11)
+        threaded = simulate_portfolio(sample_register, n_sims=2000, seed=11, n_jobs=3)
+
+        pd.testing.assert_frame_equal(serial, threaded, check_exact=True)
+
     def test_portfolio_all_zero_frequencies(self):
         """Test portfolio with all zero frequencies."""
         register = pd.DataFrame(